@@ -0,0 +1,202 @@
+import os
+import math
+import importlib
+import threading
+import wave
+from array import array
+
+try:
+    import winsound
+except ImportError:  # Not available outside Windows
+    winsound = None
+
+# Output configuration constants
+SAMPLE_RATE = 44100
+SAMPLE_WIDTH = 2  # 16-bit PCM
+MAX_AMPLITUDE = 32767
+DEFAULT_VOLUME = 0.5
+FADE_MS = 5  # Fade in/out length to avoid clicks
+BACKEND_ENV = "WINPIANO_AUDIO"
+
+
+def synth_tone(frequency: int, duration: int,
+               sample_rate: int = SAMPLE_RATE,
+               volume: float = DEFAULT_VOLUME) -> array:
+    """Synthesize a sine tone as 16-bit signed PCM samples."""
+    count = int(sample_rate * duration / 1000)
+    fade = min(int(sample_rate * FADE_MS / 1000), count // 2)
+    step = 2 * math.pi * frequency / sample_rate
+    amplitude = MAX_AMPLITUDE * volume
+
+    samples = array('h', bytes(count * SAMPLE_WIDTH))
+    for i in range(count):
+        gain = 1.0
+        if i < fade:
+            gain = i / fade
+        elif i >= count - fade:
+            gain = (count - i) / fade
+        samples[i] = int(amplitude * gain * math.sin(step * i))
+    return samples
+
+
+def write_wav(path: str, samples: array, sample_rate: int = SAMPLE_RATE) -> None:
+    """Write 16-bit mono PCM samples to a WAV file."""
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+
+
+class AudioBackend:
+    """Base class for sound output backends."""
+
+    name = "base"
+    accepts_samples = False  # True if play_samples() is supported
+    supports_hold = False  # True if note_on()/note_off() are supported
+
+    def play(self, frequency: int, duration: int) -> None:
+        """Play a tone and return once it has been handled.
+
+        Backends raise RuntimeError when the tone cannot be played,
+        including frequencies outside the range the device accepts.
+        """
+        raise NotImplementedError
+
+    def play_samples(self, samples: array, sample_rate: int = SAMPLE_RATE) -> None:
+        """Play pre-rendered 16-bit PCM samples."""
+        raise NotImplementedError
+
+    def note_on(self, frequency: int):
+        """Start a tone that sounds until note_off() and return its handle."""
+        raise NotImplementedError
+
+    def note_off(self, handle) -> None:
+        """Release a tone started by note_on()."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class WinsoundBackend(AudioBackend):
+    """Real-time output through the Windows system beeper."""
+
+    name = "winsound"
+
+    def __init__(self):
+        if winsound is None:
+            raise RuntimeError("winsound is only available on Windows")
+
+    def play(self, frequency: int, duration: int) -> None:
+        """Play a tone on the sound device, blocking for its duration."""
+        try:
+            winsound.Beep(frequency, duration)
+        except ValueError as e:  # Beep rejects frequencies outside 37-32767 Hz
+            raise RuntimeError(str(e)) from e
+
+
+class NullBackend(AudioBackend):
+    """Silent sink that only counts what would have been played."""
+
+    name = "null"
+    accepts_samples = True
+
+    def __init__(self):
+        self.notes_played = 0
+        self.total_duration = 0
+        self._lock = threading.Lock()
+
+    def play(self, frequency: int, duration: int) -> None:
+        """Discard the tone, keeping play statistics."""
+        with self._lock:
+            self.notes_played += 1
+            self.total_duration += duration
+
+    def play_samples(self, samples: array, sample_rate: int = SAMPLE_RATE) -> None:
+        """Discard the samples, keeping play statistics."""
+        self.play(0, len(samples) * 1000 // sample_rate)
+
+
+class WavBackend(AudioBackend):
+    """Offline sink that renders every tone into a PCM buffer."""
+
+    name = "wav"
+    accepts_samples = True
+
+    def __init__(self, path: str = None, sample_rate: int = SAMPLE_RATE,
+                 volume: float = DEFAULT_VOLUME):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.volume = volume
+        self.samples = array('h')
+        self._lock = threading.Lock()
+
+    def play(self, frequency: int, duration: int) -> None:
+        """Append the rendered tone to the buffer."""
+        tone = synth_tone(frequency, duration, self.sample_rate, self.volume)
+        with self._lock:
+            self.samples.extend(tone)
+
+    def play_samples(self, samples: array, sample_rate: int = SAMPLE_RATE) -> None:
+        """Append pre-rendered samples to the buffer."""
+        if sample_rate != self.sample_rate:
+            raise RuntimeError(f"Sample rate {sample_rate} does not match {self.sample_rate}")
+        with self._lock:
+            self.samples.extend(samples)
+
+    def save(self, path: str = None) -> None:
+        """Write the buffer to a WAV file."""
+        path = path or self.path
+        if not path:
+            raise ValueError("No output path for WAV backend")
+        with self._lock:
+            write_wav(path, self.samples, self.sample_rate)
+
+    def close(self) -> None:
+        """Flush the buffer to disk if an output path was given."""
+        if self.path:
+            self.save()
+
+
+BACKENDS = {
+    WinsoundBackend.name: WinsoundBackend,
+    NullBackend.name: NullBackend,
+    WavBackend.name: WavBackend,
+}
+
+# Backends with heavy dependencies (numpy), imported only when selected
+LAZY_BACKENDS = {
+    "mixer": ("app.assets.modules.mixer", "MixerBackend"),
+}
+
+_default_backend = None
+
+
+def create_backend(name: str = None, **kwargs) -> AudioBackend:
+    """Create a backend by name, falling back to the best available one."""
+    name = name or os.environ.get(BACKEND_ENV)
+    if name is None:
+        name = WinsoundBackend.name if winsound is not None else NullBackend.name
+    if name in LAZY_BACKENDS and name not in BACKENDS:
+        module, cls_name = LAZY_BACKENDS[name]
+        BACKENDS[name] = getattr(importlib.import_module(module), cls_name)
+    try:
+        backend_cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown audio backend: {name}")
+    return backend_cls(**kwargs)
+
+
+def get_backend() -> AudioBackend:
+    """Return the shared process-wide backend, creating it on first use."""
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = create_backend()
+    return _default_backend
+
+
+def set_backend(backend: AudioBackend) -> None:
+    """Replace the shared process-wide backend."""
+    global _default_backend
+    _default_backend = backend
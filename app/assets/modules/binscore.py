@@ -0,0 +1,164 @@
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from app.assets.modules.parser import parse_notes, dump_notes
+from app.assets.modules.jsonscore import read_json_sequence, write_json_notes
+from app.assets.modules.midifile import MIDI_EXTENSIONS, read_midi, write_midi
+from app.assets.modules.sequence import NoteSequence
+
+# File layout: header, then index (u32), duration (u32), frequency (u16)
+# columns, all little-endian and sorted by note index
+MAGIC = b"WPSC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")  # magic, version, flags, note count
+BINARY_EXTENSION = ".wpsc"
+
+
+def _column(typecode: str, values) -> array:
+    """Build a little-endian array column."""
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def write_score(path: str, notes: Mapping) -> None:
+    """Write a {index: (freq, duration)} score in binary format."""
+    if isinstance(notes, (BinaryScore, NoteSequence)):
+        indices, durations, freqs = notes.indices, notes.durations, notes.frequencies
+    else:
+        keys = sorted(notes.keys())
+        indices = keys
+        durations = (notes[k][1] for k in keys)
+        freqs = (notes[k][0] for k in keys)
+
+    try:
+        index_column = _column('I', indices)
+        duration_column = _column('I', durations)
+        freq_column = _column('H', freqs)
+    except OverflowError as e:
+        raise ValueError(f"Score value does not fit the binary format: {e}")
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(index_column)))
+        file.write(index_column.tobytes())
+        file.write(duration_column.tobytes())
+        file.write(freq_column.tobytes())
+
+
+class BinaryScore(Mapping):
+    """Read-only score mapped straight from a binary score file.
+
+    The index, duration and frequency columns are memoryviews into the
+    mapped file, so opening is O(1) and nothing is copied until used.
+    Lookups by note index use binary search over the sorted index column.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"Not a WinPiano binary score: {path}")
+
+        try:
+            magic, version, _, count = HEADER.unpack_from(self._map)
+        except struct.error:
+            magic, version, count = None, None, 0
+        expected_size = HEADER.size + count * 10
+        if magic != MAGIC or version != VERSION or len(self._map) < expected_size:
+            self.close()
+            raise ValueError(f"Not a WinPiano binary score: {path}")
+        if sys.byteorder == "big":
+            self.close()
+            raise ValueError("Binary scores can only be mapped on little-endian hosts")
+
+        self.count = count
+        view = memoryview(self._map)
+        offset = HEADER.size
+        self.indices = view[offset:offset + count * 4].cast('I')
+        offset += count * 4
+        self.durations = view[offset:offset + count * 4].cast('I')
+        offset += count * 4
+        self.frequencies = view[offset:offset + count * 2].cast('H')
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.indices)
+
+    def __getitem__(self, key):
+        pos = bisect_left(self.indices, key)
+        if pos == self.count or self.indices[pos] != key:
+            raise KeyError(key)
+        return self.frequencies[pos], self.durations[pos]
+
+    def items(self):
+        """Iterate (index, (freq, duration)) pairs in play order."""
+        return zip(self.indices, zip(self.frequencies, self.durations))
+
+    def to_dict(self) -> dict:
+        """Copy the score into a plain notes dict."""
+        return dict(self.items())
+
+    def to_sequence(self) -> NoteSequence:
+        """Copy the mapped columns into an in-memory NoteSequence."""
+        return NoteSequence.from_columns(self.indices, self.frequencies, self.durations)
+
+    def close(self) -> None:
+        """Release the memory views, the mapping and the file."""
+        for name in ("indices", "durations", "frequencies"):
+            column = self.__dict__.pop(name, None)
+            if column is not None:
+                column.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_score(path: str) -> Mapping:
+    """Load a score from a .txt, .json, MIDI or binary score file."""
+    if path.endswith(BINARY_EXTENSION):
+        return BinaryScore(path)
+    if path.endswith('.json'):
+        return read_json_sequence(path)
+    if path.endswith(MIDI_EXTENSIONS):
+        return read_midi(path)
+    with open(path, 'r', encoding='utf-8') as file:
+        return NoteSequence.from_dict(parse_notes(file.read()))
+
+
+def save_score(path: str, notes: Mapping) -> None:
+    """Save a score as .txt, .json, MIDI or binary depending on the extension."""
+    if path.endswith(BINARY_EXTENSION):
+        write_score(path, notes)
+    elif path.endswith('.json'):
+        write_json_notes(path, notes)
+    elif path.endswith(MIDI_EXTENSIONS):
+        write_midi(path, notes)
+    else:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(dump_notes(notes))
+
+
+def convert_score(src: str, dst: str) -> int:
+    """Convert a score between formats and return its note count."""
+    notes = load_score(src)
+    try:
+        save_score(dst, notes)
+        return len(notes)
+    finally:
+        if isinstance(notes, BinaryScore):
+            notes.close()
@@ -1,11 +1,24 @@
 import os
 import tkinter as tk
-from tkinter import ttk, scrolledtext, filedialog, messagebox
-import threading
-import winsound
-import json
-import re
-from collections import deque
+from array import array
+from tkinter import ttk, scrolledtext, filedialog, messagebox, simpledialog
+from itertools import islice
+from app.assets.modules.history import EditHistory
+from app.assets.modules.parser import (
+    scan_notes, dump_notes, NotesSyntaxError, MIN_FREQUENCY, MAX_FREQUENCY
+)
+from app.assets.modules.binscore import BINARY_EXTENSION, BinaryScore, write_score
+from app.assets.modules.jsonscore import iter_json_notes, write_json_notes
+from app.assets.modules.midifile import MIDI_EXTENSIONS, read_midi, write_midi
+from app.assets.modules.scheduler import PlaybackScheduler
+from app.assets.modules.highlighter import IncrementalHighlighter
+from app.assets.modules.formatter import IncrementalFormatter, key_width
+from app.assets.modules.sequence import (
+    NoteSequence, INDEX_TYPE, FREQUENCY_TYPE, DURATION_TYPE
+)
+from app.assets.modules.document import ScoreDocument
+from app.assets.modules.virtualview import VirtualTextView
+from app.assets.modules.worker import DEBOUNCE_MS, UiQueue, ValidationWorker
 
 # UI configuration constants
 BG_COLOR = "#2D2D2D"
@@ -16,6 +29,9 @@ FONT_FAMILY = "Consolas"
 FONT_SIZE = 12
 HOTKEY_BG = "#1E1E1E"
 HINT_COLOR = "#6C757D"
+STATUS_HINTS = "Ctrl+S: Save | Ctrl+O: Open | Ctrl+F: Format | Ctrl+P: Play"
+LOAD_BATCH = 5000  # Notes parsed per UI update while loading
+VIRTUAL_THRESHOLD = 20_000  # Scores with more lines are edited through a paged view
 
 # Example content templates
 EXAMPLE_NOTES = """{
@@ -39,10 +55,11 @@ JSON_EXAMPLE = """{
 class NotesEditor(tk.Toplevel):
     """Window for creating and editing musical note sequences."""
 
-    def __init__(self, master):
-        """Initialize the notes editor window."""
+    def __init__(self, master, notes=None):
+        """Initialize the notes editor window, optionally with a score loaded."""
         super().__init__(master)
         self.master = master
+        self.initial_notes = notes
         self.transient(self.master)
         self.grab_set()
 
@@ -52,17 +69,24 @@ class NotesEditor(tk.Toplevel):
         self.configure(bg=BG_COLOR)
         self.resizable(False, False)
 
-        # History tracking for undo/redo
-        self.history = deque(maxlen=100)
-        self.redo_stack = []
+        # Active playback, stopped when Play is pressed again
+        self.scheduler = None
+        self.playback_tempo = 1.0  # Speed of Play, the score itself is unchanged
+        self.load = None  # (after job, file) of a JSON load in progress
+        # Paged view over a ScoreDocument, used for very large scores
+        self.view = None
 
         # Initialize UI components
         self.setup_styles()
         self.create_widgets()
+        self.setup_history()
         self.setup_menu()
         self.create_statusbar()
         self.setup_text_validation()
         self.setup_syntax_highlighting()
+        self.setup_formatter()
+        self.setup_validation()
+
     def setup_styles(self):
         """Configure custom styles for UI elements."""
         self.style = ttk.Style()
@@ -111,7 +135,10 @@ class NotesEditor(tk.Toplevel):
             pady=10
         )
         self.txt_editor.grid(row=0, column=0, columnspan=4, pady=(0, 15))
-        self.txt_editor.insert("1.0", EXAMPLE_NOTES)
+        if self.initial_notes is not None:
+            self.txt_editor.insert("1.0", dump_notes(self.initial_notes))
+        else:
+            self.txt_editor.insert("1.0", EXAMPLE_NOTES)
 
         # Control buttons
         buttons = [
@@ -135,6 +162,23 @@ class NotesEditor(tk.Toplevel):
         self.menu = tk.Menu(self, tearoff=0, bg=BLACK_KEY_COLOR, fg=WHITE_KEY_COLOR)
         self.menu.add_command(label="Undo Ctrl+Z", command=self.undo)
         self.menu.add_command(label="Redo Ctrl+Y", command=self.redo)
+        self.format_on_type = tk.BooleanVar(self, value=False)
+        self.menu.add_checkbutton(label="Format as you type", variable=self.format_on_type,
+                                  command=self.toggle_format_on_type)
+
+        # Whole-score transforms, each applied as one undoable edit
+        transforms = tk.Menu(self.menu, tearoff=0, bg=BLACK_KEY_COLOR, fg=WHITE_KEY_COLOR)
+        transforms.add_command(label="Octave up",
+                               command=lambda: self.transform_action("transpose", 12))
+        transforms.add_command(label="Octave down",
+                               command=lambda: self.transform_action("transpose", -12))
+        transforms.add_command(label="Transpose...", command=self.ask_transpose)
+        transforms.add_command(label="Tempo...", command=self.ask_tempo)
+        transforms.add_command(label="Quantize...", command=self.ask_quantize)
+        transforms.add_command(label="Keep range...", command=self.ask_range)
+        transforms.add_command(label="Reverse", command=lambda: self.transform_action("reverse"))
+        self.menu.add_cascade(label="Transform", menu=transforms)
+        self.menu.add_command(label="Playback speed...", command=self.ask_playback_tempo)
         self.txt_editor.bind("<Button-3>", self.show_context_menu)
 
         # Keyboard shortcuts binding
@@ -148,13 +192,24 @@ class NotesEditor(tk.Toplevel):
         ]
         for key, cmd in shortcuts:
             self.bind_all(f"<{key}>", lambda e, c=cmd: c())
+            # The editor binding runs before the Text class ones (Ctrl+F
+            # moves the cursor and drops the selection), and stops them
+            self.txt_editor.bind(f"<{key}>", self.editor_shortcut(cmd))
+
+    @staticmethod
+    def editor_shortcut(command):
+        """Wrap a shortcut command as an editor binding that stops the event."""
+        def handler(event):
+            command()
+            return "break"
+        return handler
 
     def create_statusbar(self):
         """Create status bar with usage hints."""
         self.status = ttk.Label(
             self,
             style='Status.TLabel',
-            text="Ctrl+S: Save | Ctrl+O: Open | Ctrl+F: Format | Ctrl+P: Play"
+            text=STATUS_HINTS
         )
         self.status.pack(side=tk.BOTTOM, fill=tk.X)
 
@@ -163,10 +218,12 @@ class NotesEditor(tk.Toplevel):
                              foreground=HINT_COLOR,
                              font=(FONT_FAMILY, 9))
 
-    def setup_text_validation(self):
-        """Configure input validation and change tracking."""
-        self.txt_editor.bind('<KeyRelease>', self.on_text_changed)
+    def setup_history(self):
+        """Start recording edits for undo/redo."""
+        self.history = EditHistory(self.txt_editor)
 
+    def setup_text_validation(self):
+        """Configure input validation."""
         # Allowed input characters
         valid_keys = [
             '0', '1', '2', '3', '4', '5', '6', '7', '8', '9',
@@ -184,13 +241,6 @@ class NotesEditor(tk.Toplevel):
 
         self.txt_editor.bind('<KeyPress>', validate_input)
 
-    def setup_syntax_highlighting(self):
-        """Configure syntax highlighting rules."""
-        self.txt_editor.tag_configure("number", foreground="#4EC9B0")
-        self.txt_editor.tag_configure("structure", foreground="#569CD6")
-        self.txt_editor.tag_configure("error", background="#FFB6C1")
-        self.txt_editor.bind('<KeyRelease>', self.highlight_syntax)
-
     def setup_syntax_highlighting(self):
         """Configure syntax highlighting rules."""
         self.txt_editor.tag_configure("number", foreground="#4EC9B0")  # Numbers
@@ -198,59 +248,127 @@ class NotesEditor(tk.Toplevel):
         self.txt_editor.tag_configure("string", foreground="#CE9178")  # Strings
         self.txt_editor.tag_configure("key", foreground="#DCDCAA")  # Dictionary keys
         self.txt_editor.tag_configure("error", background="#FFB6C1")  # Error highlighting
-        self.txt_editor.bind('<KeyRelease>', self.highlight_syntax)
-
-    def highlight_syntax(self, event=None):
-        """Apply syntax highlighting to text content."""
-        text = self.txt_editor.get("1.0", "end-1c")
-
-        # Clear existing tags
-        for tag in ["number", "structure", "string", "key", "error"]:
-            self.txt_editor.tag_remove(tag, "1.0", tk.END)
-
-        # Highlighting patterns in priority order
-        patterns = [
-            (r'(".*?"|\'.*?\')', "string"),  # String literals
-            (r'\b\d+\b', "number"),  # Numbers
-            (r'\b([A-Za-z_]\w*)(?=\s*:)', "key"),  # Dictionary keys
-            (r'[{}()[$$,:]', "structure"),  # Syntax symbols
-        ]
 
-        # Apply highlighting for each pattern
-        for pattern, tag in patterns:
-            start = "1.0"
-            while True:
-                match = self.txt_editor.search(pattern, start, tk.END,
-                                               regexp=True, count=tk.Text.Count.VISIBLE)
-                if not match:
-                    break
-                end = f"{match}+{self.txt_editor.count(tk.INSERT, match, 'end', 'chars')[0]}c"
-                self.txt_editor.tag_add(tag, match, end)
-                start = end
-
-    def on_text_changed(self, event=None):
-        """Track text changes for undo/redo functionality."""
-        current_content = self.txt_editor.get("1.0", tk.END)
-        if self.history and self.history[-1] == current_content:
+        self.highlighter = IncrementalHighlighter(self.txt_editor)
+        self.history.listeners.append(self.highlighter.on_change)
+        self.highlighter.highlight_all()
+
+    def setup_formatter(self):
+        """Format edited lines in place, optionally as the user types."""
+        self.formatter = IncrementalFormatter(self.txt_editor, self.history)
+        self.txt_editor.bind('<KeyRelease>', self.formatter.on_edit, add='+')
+
+    def toggle_format_on_type(self):
+        """Turn formatting of each line as the cursor leaves it on or off."""
+        self.formatter.on_type = self.format_on_type.get()
+
+    def setup_validation(self):
+        """Validate the score on a background thread as the user types."""
+        self.ui_queue = UiQueue(self)
+        self.validator = ValidationWorker(self.ui_queue, self.on_validated)
+        self.validation = None  # (notes, errors) of the current text, once known
+        self.validated_version = -1  # History version the last request was taken at
+        self.validate_job = None
+        self.waiting = []  # Actions given the notes once the text validates
+        self.txt_editor.bind('<KeyRelease>', self.schedule_validation, add='+')
+        self.bind('<Destroy>', self.on_destroy, add='+')
+        self.validate_now()
+
+    def schedule_validation(self, event=None):
+        """Cancel stale validation and restart it after a typing pause."""
+        if self.history.version == self.validated_version:
+            return
+        self.validator.cancel()
+        self.validation = None
+        if self.validate_job is not None:
+            self.after_cancel(self.validate_job)
+        self.validate_job = self.after(DEBOUNCE_MS, self.validate_now)
+
+    def validate_now(self):
+        """Snapshot the text and hand it to the validation worker."""
+        if self.validate_job is not None:
+            self.after_cancel(self.validate_job)
+            self.validate_job = None
+        self.validation = None
+        self.validated_version = self.history.version
+        if self.view is None:
+            text = self.txt_editor.get("1.0", tk.END)
+            self.validator.submit(lambda cancel: scan_notes(text, cancel))
+        else:
+            self.view.commit()
+            self.validator.submit(self.view.document.snapshot().scan)
+
+    def accept_validation(self, notes):
+        """Record notes known to match the text, e.g. right after formatting."""
+        self.validator.cancel()
+        if self.validate_job is not None:
+            self.after_cancel(self.validate_job)
+            self.validate_job = None
+        self.validated_version = self.history.version
+        self.on_validated(notes, [])
+
+    def on_validated(self, notes, errors):
+        """Show a validation result and run the actions waiting for it."""
+        if self.history.version != self.validated_version:
+            # Changed programmatically since the snapshot; whoever changed
+            # it validates again, unless an action is already waiting
+            if self.waiting:
+                self.validate_now()
+            return
+        waiting, self.waiting = self.waiting, []
+        if notes is None:
+            self.update_status()
+            if waiting:
+                messagebox.showerror("Error", str(errors))
             return
 
-        self.history.append(current_content)
-        self.redo_stack.clear()
+        self.validation = (notes, errors)
+        self.mark_errors(errors)
+        self.update_status()
+        if errors:
+            if waiting:
+                self.highlight_errors(errors)
+                messagebox.showerror("Error", f"Format error:\n{str(NotesSyntaxError(errors))}")
+            return
+        self.formatter.key_width = key_width(notes)
+        for action in waiting:
+            action(notes)
+
+    def when_valid(self, action):
+        """Call action(notes) once the current text validates, without blocking."""
+        self.waiting.append(action)
+        if self.validation is not None and self.history.version == self.validated_version:
+            self.on_validated(*self.validation)
+        elif self.validate_job is not None or self.history.version != self.validated_version:
+            # Skip the rest of the typing pause
+            self.validate_now()
+
+    def on_destroy(self, event):
+        """Stop background work when the window closes."""
+        if event.widget is self:
+            self.cancel_load()
+            self.validator.close()
+            self.ui_queue.close()
+
+    def update_status(self):
+        """Show the usage hints plus the paging and validation state."""
+        text = STATUS_HINTS
+        if self.view is not None:
+            text += f" | {self.view.document.line_count} lines, paged"
+        if self.validation is not None and self.validation[1]:
+            count = len(self.validation[1])
+            text += f" | {count} error{'s' if count > 1 else ''}"
+        self.status.configure(text=text)
 
     def undo(self):
-        """Revert to previous text state."""
-        if len(self.history) > 1:
-            self.redo_stack.append(self.history.pop())
-            self.txt_editor.delete("1.0", tk.END)
-            self.txt_editor.insert("1.0", self.history[-1])
+        """Revert the last edit."""
+        if self.history.undo():
+            self.schedule_validation()
 
     def redo(self):
-        """Restore next text state from redo stack."""
-        if self.redo_stack:
-            content = self.redo_stack.pop()
-            self.history.append(content)
-            self.txt_editor.delete("1.0", tk.END)
-            self.txt_editor.insert("1.0", content)
+        """Reapply the last undone edit."""
+        if self.history.redo():
+            self.schedule_validation()
 
     def show_context_menu(self, event):
         """Display right-click context menu."""
@@ -259,96 +377,178 @@ class NotesEditor(tk.Toplevel):
         finally:
             self.menu.grab_release()
 
-    def format_notes(self, notes_str: str) -> dict:
-        """Parse and validate notes from text input."""
-        try:
-            cleaned_str = notes_str.strip().replace('\t', '    ')
-            notes_dict = eval(cleaned_str)
-
-            if not isinstance(notes_dict, dict):
-                raise ValueError("Notes must be in dictionary format")
-
-            formatted = {}
-            for k, v in notes_dict.items():
-                # Validate key type
-                try:
-                    key = int(k)
-                except ValueError:
-                    raise ValueError(f"Invalid key: {k}")
+    def mark_errors(self, errors: list):
+        """Mark error lines that are in the widget, without scrolling."""
+        self.txt_editor.tag_remove("error", "1.0", tk.END)
+        offset = 0
+        if self.view is not None:
+            # Error lines are document lines; only the window is shown
+            offset = self.view.window_start - 1
+            errors = [error for error in errors
+                      if 0 < error.line - offset <= self.view.window_count]
+        for error in errors:
+            line = error.line - offset
+            self.txt_editor.tag_add("error", f"{line}.0", f"{line}.end")
+
+    def highlight_errors(self, errors: list):
+        """Highlight problematic lines and scroll to the first one."""
+        if not errors:
+            return
+        first = errors[0]
+        if self.view is not None:
+            self.view.show_line(first.line)
+            self.mark_errors(errors)
+            return
+        self.mark_errors(errors)
+        self.txt_editor.see(f"{first.line}.{first.column - 1}")
+
+    def show_notes(self, notes):
+        """Replace the editor content with a score, paging large ones."""
+        if len(notes) > VIRTUAL_THRESHOLD:
+            self.show_document(ScoreDocument(notes))
+            self.accept_validation(notes)
+            return
+        self.close_document()
+        with self.history.compound():
+            self.txt_editor.delete("1.0", tk.END)
+            self.txt_editor.insert("1.0", dump_notes(notes))
+        self.highlighter.highlight_all()
+        self.history.clear()
+        self.accept_validation(notes)
+
+    def show_document(self, document: ScoreDocument, top: int = 1):
+        """Edit a document through the paged view."""
+        if self.view is None:
+            self.view = VirtualTextView(self.txt_editor, self.txt_editor.vbar,
+                                        document, on_page=self.on_page, history=self.history)
+        else:
+            self.view.set_document(document, top)
+        self.history.clear()
+        self.update_status()
+
+    def close_document(self):
+        """Leave the paged view and edit the widget text directly."""
+        if self.view is not None:
+            self.view.detach()
+            self.view = None
+            self.update_status()
+
+    def on_page(self):
+        """Refresh per-window state after the paged view loads new lines."""
+        self.highlighter.highlight_all()
+        if self.view is None or self.validate_job is not None:
+            return  # Still being set up, or validation is already due
+        if self.validation is not None:
+            # Paging moves text in and out of the widget without changing it
+            self.validated_version = self.history.version
+            self.mark_errors(self.validation[1])
+        else:
+            self.validate_now()
 
-                # Validate value structure
-                if not isinstance(v, (tuple, list)) or len(v) != 2:
-                    raise ValueError(f"Invalid format for note {k}")
+    @staticmethod
+    def play_notes(notes_dict: dict, backend=None, tempo: float = 1.0,
+                   on_error=None) -> PlaybackScheduler:
+        """Play notes through the audio backend on a drift-free timeline.
 
-                # Validate frequency and duration values
-                try:
-                    freq = int(v[0])
-                    duration = int(v[1])
-                except (ValueError, TypeError):
-                    raise ValueError(f"Invalid values for note {k}")
+        on_error is called from the playback thread.
+        """
+        scheduler = PlaybackScheduler(backend, on_error=on_error)
+        scheduler.play(notes_dict, tempo)
+        return scheduler
 
-                # Validate frequency range
-                if not 37 <= freq <= 32767:
-                    raise ValueError(f"Frequency {freq}Hz out of range (37-32767)")
+    def show_sound_error(self, error: Exception):
+        """Report a playback failure posted from the scheduler thread."""
+        messagebox.showerror("Error", f"Sound error: {str(error)}")
 
-                formatted[key] = (freq, duration)
+    def format_action(self):
+        """Format the selected lines, or the whole score once it validates."""
+        try:
+            first = self.txt_editor.index(tk.SEL_FIRST)
+            last = self.txt_editor.index(tk.SEL_LAST)
+        except tk.TclError:
+            self.when_valid(self.apply_format)
+            return
+        self.formatter.format_lines(int(first.split('.')[0]), int(last.split('.')[0]))
+        self.schedule_validation()
 
-            return formatted
+    def apply_format(self, notes):
+        """Rewrite the text as the formatted score, editing only what differs."""
+        try:
+            if self.view is not None:
+                self.view.set_document(ScoreDocument(notes))
+                self.history.clear()
+            else:
+                self.formatter.replace_all(dump_notes(notes))
+            self.accept_validation(notes)
 
         except Exception as e:
-            self.highlight_error(e)
-            messagebox.showerror("Error", f"Format error: {str(e)}")
-            return {}
-
-    def highlight_error(self, exception):
-        """Highlight problematic lines in the editor."""
-        match = re.search(r'(\d+)$', str(exception))
-        if match:
-            line_no = int(match.group())
-            start = f"{line_no}.0"
-            end = f"{line_no}.end"
-            self.txt_editor.tag_add("error", start, end)
-            self.txt_editor.see(start)
+            messagebox.showerror("Error", str(e))
 
-    @staticmethod
-    def play_notes(notes_dict: dict) -> None:
-        """Play notes using system beep sounds."""
-        def play_in_thread():
+    def transform_action(self, name: str, *args):
+        """Apply a transform from the transform module to the validated score."""
+        def apply(notes):
             try:
-                for key in sorted(notes_dict.keys()):
-                    freq, duration = notes_dict[key]
-                    winsound.Beep(freq, duration)
-            except RuntimeError as e:
-                messagebox.showerror("Error", f"Sound error: {str(e)}")
+                # NumPy is only needed for transforms
+                from app.assets.modules import transform
+                result = getattr(transform, name)(notes, *args)
             except Exception as e:
-                messagebox.showerror("Error", f"Playback error: {str(e)}")
-
-        threading.Thread(target=play_in_thread, daemon=True).start()
-
-    def format_action(self):
-        """Format and validate the text input."""
-        try:
-            content = self.txt_editor.get("1.0", tk.END)
-            formatted = self.format_notes(content)
-
-            if formatted:
-                # Generate formatted text output
-                original_order = list(formatted.keys())
-                max_key_len = max(len(str(k)) for k in original_order)
+                messagebox.showerror("Error", f"Transform error: {str(e)}")
+                return
+            if self.view is None and len(result) > VIRTUAL_THRESHOLD:
+                self.show_notes(result)
+            else:
+                self.apply_format(result)
 
-                entries = []
-                for k in original_order:
-                    v = formatted[k]
-                    key_str = str(k).rjust(max_key_len)
-                    entry = f"    {key_str}: ({v[0]:>5}, {v[1]:>4})"
-                    entries.append(entry)
+        self.when_valid(apply)
 
-                formatted_text = "{\n" + ",\n".join(entries) + "\n}"
-                self.txt_editor.delete("1.0", tk.END)
-                self.txt_editor.insert("1.0", formatted_text)
+    def ask_transpose(self):
+        """Ask for a pitch shift in semitones and cents."""
+        semitones = simpledialog.askfloat(
+            "Transpose", "Semitones (negative to go down, 0.01 = 1 cent):", parent=self
+        )
+        if semitones:
+            self.transform_action("transpose", semitones)
+
+    def ask_tempo(self):
+        """Ask for a tempo change in percent."""
+        percent = simpledialog.askfloat(
+            "Tempo", "Tempo in percent (110 plays 10% faster):",
+            parent=self, initialvalue=100, minvalue=1
+        )
+        if percent and percent != 100:
+            self.transform_action("scale_durations", 100.0 / percent)
+
+    def ask_playback_tempo(self):
+        """Ask how fast Play runs, in percent, without changing the score."""
+        percent = simpledialog.askfloat(
+            "Playback speed", "Speed in percent (200 plays twice as fast):",
+            parent=self, initialvalue=self.playback_tempo * 100, minvalue=1
+        )
+        if percent:
+            self.playback_tempo = percent / 100.0
 
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+    def ask_quantize(self):
+        """Ask for a grid to snap note boundaries to."""
+        grid = simpledialog.askinteger(
+            "Quantize", "Grid in milliseconds:", parent=self, initialvalue=50, minvalue=1
+        )
+        if grid:
+            self.transform_action("quantize", grid)
+
+    def ask_range(self):
+        """Ask for a frequency range; notes outside it become rests."""
+        low = simpledialog.askinteger(
+            "Keep range", "Lowest frequency (Hz):", parent=self,
+            initialvalue=MIN_FREQUENCY, minvalue=MIN_FREQUENCY, maxvalue=MAX_FREQUENCY
+        )
+        if low is None:
+            return
+        high = simpledialog.askinteger(
+            "Keep range", "Highest frequency (Hz):", parent=self,
+            initialvalue=MAX_FREQUENCY, minvalue=low, maxvalue=MAX_FREQUENCY
+        )
+        if high is not None:
+            self.transform_action("filter_range", low, high)
 
     def save_file(self):
         """Save notes to file in text or JSON format."""
@@ -357,23 +557,48 @@ class NotesEditor(tk.Toplevel):
             filetypes=[
                 ("Text Files", "*.txt"),
                 ("JSON Files", "*.json"),
+                ("Binary Scores", f"*{BINARY_EXTENSION}"),
+                ("MIDI Files", "*.mid *.midi"),
+                ("WAV Audio", "*.wav"),
                 ("All Files", "*.*")
             ],
             defaultextension=".txt"
         )
-        if filepath:
+        if filepath and filepath.endswith(('.wav', '.json', BINARY_EXTENSION) + MIDI_EXTENSIONS):
+            # Score formats are written from the validated notes
+            self.when_valid(lambda notes: self.export_notes(filepath, notes))
+        elif filepath:
             try:
-                content = self.txt_editor.get("1.0", tk.END)
-                if filepath.endswith('.json'):
-                    notes = self.format_notes(content)
+                if self.view is not None:
+                    self.view.commit()
+                    lines = self.view.document.iter_lines()
                     with open(filepath, 'w', encoding='utf-8') as file:
-                        json.dump({"notes": notes}, file, indent=4)
+                        file.writelines(line.expandtabs(4) + "\n" for line in lines)
                 else:
+                    content = self.txt_editor.get("1.0", tk.END)
                     with open(filepath, 'w', encoding='utf-8') as file:
                         file.write(content.expandtabs(4))
             except Exception as e:
                 messagebox.showerror("Error", f"Save error: {str(e)}")
 
+    def export_notes(self, filepath: str, notes):
+        """Write validated notes to a score or audio file."""
+        if not notes:
+            return
+        try:
+            if filepath.endswith('.wav'):
+                # NumPy is only needed for audio export
+                from app.assets.modules.renderer import render_to_wav
+                render_to_wav(notes, filepath)
+            elif filepath.endswith(BINARY_EXTENSION):
+                write_score(filepath, notes)
+            elif filepath.endswith('.json'):
+                write_json_notes(filepath, notes)
+            else:
+                write_midi(filepath, notes)
+        except Exception as e:
+            messagebox.showerror("Error", f"Save error: {str(e)}")
+
     def open_file(self):
         """Open and load notes from file."""
         filepath = filedialog.askopenfilename(
@@ -381,36 +606,120 @@ class NotesEditor(tk.Toplevel):
             filetypes=[
                 ("Text Files", "*.txt"),
                 ("JSON Files", "*.json"),
+                ("Binary Scores", f"*{BINARY_EXTENSION}"),
+                ("MIDI Files", "*.mid *.midi"),
                 ("All Files", "*.*")
             ]
         )
-        if filepath:
+        if filepath and self.load is not None:
+            # The new file replaces a JSON score still being loaded
+            self.cancel_load()
+            self.txt_editor.configure(state='normal')
+            self.update_status()
+        if filepath and filepath.endswith((BINARY_EXTENSION,) + MIDI_EXTENSIONS):
+            try:
+                if filepath.endswith(MIDI_EXTENSIONS):
+                    self.show_notes(read_midi(filepath))
+                else:
+                    with BinaryScore(filepath) as score:
+                        self.show_notes(score.to_sequence())
+            except Exception as e:
+                messagebox.showerror("Error", f"Load error: {str(e)}")
+        elif filepath and filepath.endswith('.json'):
+            try:
+                self.load_json(filepath)
+            except Exception as e:
+                messagebox.showerror("Error", f"Load error: {str(e)}")
+        elif filepath:
             try:
                 with open(filepath, "r", encoding="utf-8") as file:
-                    if filepath.endswith('.json'):
-                        data = json.load(file)
-                        content = "{\n"
-                        for k, v in data['notes'].items():
-                            content += f"    {k}: ({v[0]}, {v[1]}),\n"
-                        content += "}"
-                    else:
-                        content = file.read()
+                    content = file.read()
 
+                    if content.count('\n') > VIRTUAL_THRESHOLD:
+                        self.show_document(ScoreDocument.from_text(content))
+                        self.validate_now()
+                        return
+                    self.close_document()
                     self.txt_editor.delete("1.0", tk.END)
                     self.txt_editor.insert("1.0", content)
+                    self.highlighter.highlight_all()
+                    self.history.clear()
                     self.format_action()
 
             except Exception as e:
                 messagebox.showerror("Error", f"Load error: {str(e)}")
 
+    def load_json(self, filepath: str):
+        """Parse a JSON score in batches with progress, then show it.
+
+        The editor is left untouched until the whole file has parsed, so
+        a malformed file never replaces the current score; large scores
+        then open in the paged view.
+        """
+        total = max(os.path.getsize(filepath), 1)
+        file = open(filepath, "r", encoding="utf-8")
+        progress = [0]
+        notes = iter_json_notes(file, progress=lambda read: progress.__setitem__(0, read))
+        indices = array(INDEX_TYPE)
+        frequencies = array(FREQUENCY_TYPE)
+        durations = array(DURATION_TYPE)
+        self.txt_editor.configure(state='disabled')
+
+        def finish(error=None):
+            self.load = None
+            file.close()
+            self.txt_editor.configure(state='normal')
+            if error is not None:
+                self.update_status()
+                messagebox.showerror("Error", f"Load error: {str(error)}")
+                return
+            self.show_notes(NoteSequence.from_columns(indices, frequencies, durations))
+            self.update_status()
+
+        def load_batch():
+            try:
+                count = 0
+                for k, freq, duration in islice(notes, LOAD_BATCH):
+                    indices.append(k)
+                    frequencies.append(freq)
+                    durations.append(duration)
+                    count += 1
+            except ValueError as e:
+                finish(e)
+                return
+            if not count:
+                finish()
+                return
+
+            percent = min(progress[0] * 100 // total, 100)
+            self.status.configure(text=f"Loading {os.path.basename(filepath)}: {percent}%")
+            self.load = (self.after(1, load_batch), file)
+
+        load_batch()
+
+    def cancel_load(self):
+        """Stop a JSON load in progress; the editor keeps its old score."""
+        if self.load is not None:
+            job, file = self.load
+            self.after_cancel(job)
+            file.close()
+            self.load = None
+
     def play_action(self):
-        """Trigger note playback."""
-        content = self.txt_editor.get("1.0", tk.END)
-        notes = self.format_notes(content)
+        """Trigger note playback once the text validates."""
+        self.when_valid(self.start_playback)
+
+    def start_playback(self, notes):
+        """Play validated notes, replacing any playback in progress."""
         if notes:
-            self.play_notes(notes)
+            if self.scheduler:
+                self.scheduler.stop()
+            self.scheduler = self.play_notes(
+                notes, tempo=self.playback_tempo,
+                on_error=lambda e: self.ui_queue.post(self.show_sound_error, e)
+            )
 
 
-def creator_notes(master):
+def creator_notes(master, notes=None):
     """Launch the notes editor window."""
-    NotesEditor(master)
+    NotesEditor(master, notes)
@@ -0,0 +1,192 @@
+from array import array
+from bisect import bisect_right
+
+from app.assets.modules.parser import ParseCancelled, ParseError, scan_notes
+from app.assets.modules.sequence import NoteSequence
+
+
+class ScoreDocument:
+    """Editor text kept as a piece table over a NoteSequence.
+
+    Each piece is either a (start, end) range of note positions, whose
+    lines are formatted on demand exactly as dump_notes writes them, or a
+    list of literal lines holding text the user has edited. A million
+    untouched notes therefore cost their 12-byte columns, not a million
+    strings, and only edited regions are ever re-parsed.
+    """
+
+    def __init__(self, notes=None, lines=None):
+        self.sequence = NoteSequence.from_dict(notes) if notes is not None else NoteSequence()
+        count = len(self.sequence)
+        self.key_width = len(str(self.sequence.indices[-1])) if count else 1
+        if lines is not None:
+            self.pieces = [list(lines)]
+        elif count:
+            self.pieces = [["{"], (0, count), ["}"]]
+        else:
+            self.pieces = [["{", "}"]]
+        self._reindex()
+
+    @classmethod
+    def from_text(cls, text: str) -> "ScoreDocument":
+        """Build a document from raw editor text."""
+        return cls(lines=text.split('\n'))
+
+    def _reindex(self) -> None:
+        """Recompute the first document line of every piece."""
+        self._starts = []
+        line = 1
+        for piece in self.pieces:
+            self._starts.append(line)
+            line += self._piece_length(piece)
+        self.line_count = line - 1
+
+    @staticmethod
+    def _piece_length(piece) -> int:
+        return piece[1] - piece[0] if isinstance(piece, tuple) else len(piece)
+
+    def _format(self, pos: int) -> str:
+        """Format the note at a sequence position as one editor line."""
+        seq = self.sequence
+        comma = "," if pos < len(seq) - 1 else ""
+        key = str(seq.indices[pos]).rjust(self.key_width)
+        return f"    {key}: ({seq.frequencies[pos]:>5}, {seq.durations[pos]:>4}){comma}"
+
+    def lines(self, first: int, last: int) -> list:
+        """Return document lines first..last (1-based, inclusive)."""
+        first = max(first, 1)
+        last = min(last, self.line_count)
+        result = []
+        n = bisect_right(self._starts, first) - 1
+        line = first
+        while line <= last and n < len(self.pieces):
+            piece = self.pieces[n]
+            offset = line - self._starts[n]
+            take = min(self._piece_length(piece) - offset, last - line + 1)
+            if isinstance(piece, tuple):
+                start = piece[0] + offset
+                result.extend(self._format(pos) for pos in range(start, start + take))
+            else:
+                result.extend(piece[offset:offset + take])
+            line += take
+            n += 1
+        return result
+
+    def iter_lines(self, batch: int = 10_000):
+        """Yield every line of the document, formatting in batches."""
+        for first in range(1, self.line_count + 1, batch):
+            yield from self.lines(first, first + batch - 1)
+
+    def text(self) -> str:
+        """The whole document as one string."""
+        return "\n".join(self.iter_lines())
+
+    def _split(self, line: int) -> int:
+        """Make a piece start at a document line; return that piece's index."""
+        if line > self.line_count:
+            return len(self.pieces)
+        n = bisect_right(self._starts, line) - 1
+        offset = line - self._starts[n]
+        if offset == 0:
+            return n
+        piece = self.pieces[n]
+        if isinstance(piece, tuple):
+            head, tail = (piece[0], piece[0] + offset), (piece[0] + offset, piece[1])
+        else:
+            head, tail = piece[:offset], piece[offset:]
+        self.pieces[n:n + 1] = [head, tail]
+        self._starts.insert(n + 1, line)
+        return n + 1
+
+    def replace(self, first: int, last: int, new_lines: list) -> None:
+        """Replace lines first..last (inclusive) with literal lines.
+
+        Use last = first - 1 to insert before line first.
+        """
+        i = self._split(first)
+        j = self._split(last + 1) if last >= first else i
+        pieces = self.pieces[:i]
+        if new_lines:
+            pieces.append(list(new_lines))
+        pieces.extend(self.pieces[j:])
+
+        # Merge neighbouring literal pieces so the table stays short
+        self.pieces = []
+        for piece in pieces:
+            if not self._piece_length(piece):
+                continue
+            if self.pieces and isinstance(piece, list) and isinstance(self.pieces[-1], list):
+                self.pieces[-1] = self.pieces[-1] + piece
+            else:
+                self.pieces.append(piece)
+        self._reindex()
+
+    def snapshot(self) -> "ScoreDocument":
+        """A copy that later edits do not affect, for scanning off-thread.
+
+        Edits replace pieces rather than mutating them, so copying the
+        piece table is enough; the note columns are shared.
+        """
+        copy = ScoreDocument.__new__(ScoreDocument)
+        copy.sequence = self.sequence
+        copy.key_width = self.key_width
+        copy.pieces = list(self.pieces)
+        copy._starts = list(self._starts)
+        copy.line_count = self.line_count
+        return copy
+
+    def scan(self, cancel=None) -> tuple:
+        """Parse the document into (NoteSequence, errors) without raising.
+
+        Untouched note ranges are copied column-wise; only literal pieces
+        go through the parser. Error lines are document line numbers. A
+        set cancel event stops the scan with ParseCancelled.
+        """
+        indices, frequencies, durations = array('I'), array('I'), array('I')
+        errors = []
+        seq = self.sequence
+        last = len(self.pieces) - 1
+        if last < 0:
+            errors.append(ParseError(1, 1, "Notes must be in dictionary format"))
+        for n, piece in enumerate(self.pieces):
+            if cancel is not None and cancel.is_set():
+                raise ParseCancelled()
+            if isinstance(piece, tuple):
+                start, end = piece
+                indices.extend(seq.indices[start:end])
+                frequencies.extend(seq.frequencies[start:end])
+                durations.extend(seq.durations[start:end])
+                # Note lines at the document edges lack the enclosing braces
+                if n == 0:
+                    errors.append(ParseError(1, 5, "Notes must be in dictionary format"))
+                if n == last:
+                    errors.append(ParseError(self.line_count, len(self._format(end - 1)) + 1,
+                                             "Missing closing '}'"))
+                continue
+            # A literal piece is parsed between the neighbouring note lines,
+            # so a missing or stray separator at its edges is still reported
+            context = []
+            prefix = suffix = ""
+            if n > 0:
+                pos = self.pieces[n - 1][1] - 1
+                context.append(pos)
+                prefix = "{\n" + self._format(pos) + "\n"
+            if n < last:
+                pos = self.pieces[n + 1][0]
+                context.append(pos)
+                suffix = "\n" + self._format(pos) + "\n}"
+            notes, piece_errors = scan_notes(prefix + "\n".join(piece) + suffix, cancel)
+            shift = self._starts[n] - 1 - prefix.count("\n")
+            for error in piece_errors:
+                error.line += shift
+                errors.append(error)
+            # Neighbour notes are already copied, unless the piece redefines them
+            for pos in context:
+                key = seq.indices[pos]
+                if notes.get(key) == (seq.frequencies[pos], seq.durations[pos]):
+                    del notes[key]
+            for key, (freq, duration) in notes.items():
+                indices.append(key)
+                frequencies.append(freq)
+                durations.append(duration)
+        return NoteSequence(indices, frequencies, durations), errors
@@ -0,0 +1,152 @@
+import tkinter as tk
+
+from app.assets.modules.parser import format_line
+from app.assets.modules.sequence import NoteSequence
+
+
+def key_width(notes) -> int:
+    """Width dump_notes pads note indices to for a score."""
+    if isinstance(notes, NoteSequence):
+        last = notes.indices[-1] if len(notes) else 0
+    else:
+        last = max(notes, default=0)
+    return len(str(last))
+
+
+def changed_span(old: str, new: str) -> tuple:
+    """Return (start, old end, new end) of the part of a line that differs."""
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old[start] == new[start]:
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    return start, old_end, new_end
+
+
+def map_column(old: str, new: str, column: int) -> int:
+    """Move a cursor column across a reformat by counting non-blank characters."""
+    count = sum(1 for ch in old[:column] if not ch.isspace())
+    if not count:
+        return min(column, len(new) - len(new.lstrip()))
+    seen = 0
+    for i, ch in enumerate(new):
+        if not ch.isspace():
+            seen += 1
+            if seen == count:
+                return i + 1
+    return len(new)
+
+
+class IncrementalFormatter:
+    """Formats lines of a Tk text widget in place with minimal edits.
+
+    Each line is compared with its formatted form and only the differing
+    span is deleted and reinserted, so marks, tags on untouched text and
+    the scroll position survive, and the whole format is one undo step.
+    On-type mode formats a line as the cursor leaves it, which costs one
+    short regex match per line left.
+    """
+
+    def __init__(self, text_widget: tk.Text, history):
+        self.text = text_widget
+        self.history = history
+        self.key_width = 1  # Index padding, updated from the last valid score
+        self.on_type = False
+        self._last_line = self._insert_line()
+
+    def _insert_line(self) -> int:
+        return int(self.text.index(tk.INSERT).split('.')[0])
+
+    def _line_count(self) -> int:
+        return int(self.text.index("end-1c").split('.')[0])
+
+    def format_lines(self, first: int, last: int, skip: int = None) -> int:
+        """Format lines first..last in place; return how many changed.
+
+        Lines that don't hold a single entry or brace are left alone, as
+        is the skip line (the one being typed in on-type mode).
+        """
+        first = max(first, 1)
+        last = min(last, self._line_count())
+        if first > last:
+            return 0
+        lines = self.text.get(f"{first}.0", f"{last}.end").split('\n')
+        edits = []
+        for line_no, line in enumerate(lines, first):
+            new = format_line(line, self.key_width)
+            if new is not None and new != line and line_no != skip:
+                edits.append((line_no, line, new))
+        self.apply(edits)
+        return len(edits)
+
+    def apply(self, edits: list) -> None:
+        """Rewrite (line number, old text, new text) lines as one undo step."""
+        if not edits:
+            return
+        cursor_line, cursor_col = map(int, self.text.index(tk.INSERT).split('.'))
+        top = self.text.index("@0,0")
+        with self.history.compound():
+            for line_no, old, new in edits:
+                start, old_end, new_end = changed_span(old, new)
+                if old_end > start:
+                    self.text.delete(f"{line_no}.{start}", f"{line_no}.{old_end}")
+                if new_end > start:
+                    self.text.insert(f"{line_no}.{start}", new[start:new_end])
+                if line_no == cursor_line:
+                    cursor_col = map_column(old, new, cursor_col)
+        self.text.mark_set(tk.INSERT, f"{cursor_line}.{cursor_col}")
+        self.text.yview(top)
+
+    def replace_all(self, new_text: str) -> None:
+        """Turn the whole buffer into new_text, editing only what differs.
+
+        Matching lines at both ends are kept; a middle block with the
+        same line count is edited line by line, anything else is replaced
+        as one block.
+        """
+        old = self.text.get("1.0", "end-1c").split('\n')
+        new = new_text.split('\n')
+        head = 0
+        limit = min(len(old), len(new))
+        while head < limit and old[head] == new[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and old[-1 - tail] == new[-1 - tail]:
+            tail += 1
+        old_mid = old[head:len(old) - tail]
+        new_mid = new[head:len(new) - tail]
+
+        if len(old_mid) == len(new_mid):
+            self.apply([(head + 1 + i, a, b) for i, (a, b) in enumerate(zip(old_mid, new_mid))
+                        if a != b])
+            return
+
+        # Line count differs: replace the block, keeping the view where it was
+        top = self.text.index("@0,0")
+        cursor = self.text.index(tk.INSERT)
+        first, last = head + 1, head + len(old_mid)
+        with self.history.compound():
+            if tail:
+                start, end = f"{first}.0", f"{last + 1}.0"
+                block = "".join(line + "\n" for line in new_mid)
+            elif head:
+                start, end = f"{head}.end", "end-1c"
+                block = "".join("\n" + line for line in new_mid)
+            else:
+                start, end = "1.0", "end-1c"
+                block = "\n".join(new_mid)
+            self.text.delete(start, end)
+            if block:
+                self.text.insert(start, block)
+        self.text.mark_set(tk.INSERT, cursor)
+        self.text.yview(top)
+
+    def on_edit(self, event=None) -> None:
+        """In on-type mode, format the lines the cursor just left."""
+        line = self._insert_line()
+        if self.on_type and line != self._last_line:
+            self.format_lines(min(line, self._last_line), max(line, self._last_line), skip=line)
+        self._last_line = line
@@ -0,0 +1,121 @@
+import re
+import tkinter as tk
+
+from app.assets.modules.history import INSERT
+
+# Highlighting tags in priority order, plus the error marker
+TOKEN_TAGS = ("string", "number", "key", "structure")
+ERROR_TAG = "error"
+
+# One alternation so each line is tokenized in a single regex pass
+TOKEN_PATTERN = re.compile(
+    r'(?P<string>"[^"\n]*"|\'[^\'\n]*\')'  # String literals
+    r'|(?P<number>\b\d+\b)'  # Numbers
+    r'|(?P<key>\b[A-Za-z_]\w*(?=\s*:))'  # Dictionary keys
+    r'|(?P<structure>[{}()\[\],:])'  # Syntax symbols
+)
+
+# Lines re-highlighted around each edit and per background chunk
+DIRTY_MARGIN = 1
+CHUNK_LINES = 2000
+
+
+def tokenize_lines(lines, first_line: int = 1) -> dict:
+    """Collect Tk index ranges for every token tag in the given lines.
+
+    Returns {tag: [start, end, start, end, ...]} ready for a single
+    batched tag_add call per tag.
+    """
+    ranges = {tag: [] for tag in TOKEN_TAGS}
+    finditer = TOKEN_PATTERN.finditer
+    for line_no, line in enumerate(lines, first_line):
+        for match in finditer(line):
+            tag_ranges = ranges[match.lastgroup]
+            tag_ranges.append(f"{line_no}.{match.start()}")
+            tag_ranges.append(f"{line_no}.{match.end()}")
+    return ranges
+
+
+class IncrementalHighlighter:
+    """Syntax highlighter that re-tokenizes only the edited lines.
+
+    Tokens never span lines, so every line can be highlighted on its own.
+    Every insert and delete reported by the edit history (typing, pastes,
+    undo/redo, programmatic rewrites) marks its lines dirty, and the dirty
+    range plus a margin is re-highlighted once the Tk loop is idle. Full
+    passes run in chunks from the Tk loop.
+    """
+
+    def __init__(self, text_widget: tk.Text, margin: int = DIRTY_MARGIN,
+                 chunk_lines: int = CHUNK_LINES):
+        self.text = text_widget
+        self.margin = margin
+        self.chunk_lines = chunk_lines
+        self._dirty = None  # (first, last) lines changed since the last flush
+        self._flush_job = None
+        self._pending_job = None
+
+    def _line_count(self) -> int:
+        return int(self.text.index("end-1c").split('.')[0])
+
+    def highlight_lines(self, first: int, last: int) -> None:
+        """Re-highlight an inclusive range of lines."""
+        line_count = self._line_count()
+        first = max(first, 1)
+        last = min(last, line_count)
+        if first > last:
+            return
+
+        start, end = f"{first}.0", f"{last}.end"
+        for tag in TOKEN_TAGS + (ERROR_TAG,):
+            self.text.tag_remove(tag, start, end)
+
+        lines = self.text.get(start, end).split('\n')
+        for tag, tag_ranges in tokenize_lines(lines, first).items():
+            if tag_ranges:
+                self.text.tag_add(tag, *tag_ranges)
+
+    def on_change(self, op) -> None:
+        """Mark the lines of an edit dirty; called before it is applied."""
+        line = int(op.index.split('.')[0])
+        newlines = op.text.count('\n')
+        if op.kind == INSERT:
+            def shift(n):
+                return n + newlines if n > line else n
+            changed = (line, line + newlines)
+        else:
+            # Deleted lines collapse onto the first one, later lines move up
+            def shift(n):
+                return n - newlines if n > line + newlines else min(n, line)
+            changed = (line, line)
+
+        if self._dirty is None:
+            self._dirty = changed
+        else:
+            first, last = map(shift, self._dirty)
+            self._dirty = (min(first, changed[0]), max(last, changed[1]))
+        if self._flush_job is None:
+            self._flush_job = self.text.after_idle(self.flush)
+
+    def flush(self) -> None:
+        """Re-highlight the lines changed since the last flush."""
+        self._flush_job = None
+        if self._dirty is not None:
+            first, last = self._dirty
+            self._dirty = None
+            self.highlight_lines(first - self.margin, last + self.margin)
+
+    def highlight_all(self) -> None:
+        """Re-highlight the whole buffer in chunks without blocking the UI."""
+        if self._pending_job is not None:
+            self.text.after_cancel(self._pending_job)
+        self._dirty = None  # Covered by the full pass
+        self._highlight_chunk(1)
+
+    def _highlight_chunk(self, first: int) -> None:
+        last = first + self.chunk_lines - 1
+        self.highlight_lines(first, last)
+        if last < self._line_count():
+            self._pending_job = self.text.after(1, self._highlight_chunk, last + 1)
+        else:
+            self._pending_job = None
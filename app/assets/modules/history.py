@@ -0,0 +1,251 @@
+import time
+import tkinter as tk
+from collections import deque
+from contextlib import contextmanager
+
+# History configuration constants
+MAX_UNDO_GROUPS = 100
+COALESCE_SECONDS = 1.0  # Typing pause that starts a new undo step
+
+INSERT = "insert"
+DELETE = "delete"
+
+
+class EditOp:
+    """A single text insertion or deletion at a Tk "line.col" index."""
+
+    __slots__ = ("kind", "index", "text")
+
+    def __init__(self, kind: str, index: str, text: str):
+        self.kind = kind
+        self.index = index
+        self.text = text
+
+    def end_index(self) -> str:
+        """Index just after the inserted or deleted text."""
+        line, col = map(int, self.index.split('.'))
+        newlines = self.text.count('\n')
+        if newlines:
+            tail = len(self.text) - self.text.rfind('\n') - 1
+            return f"{line + newlines}.{tail}"
+        return f"{line}.{col + len(self.text)}"
+
+    def shifted(self, lines: int) -> "EditOp":
+        """A copy of the operation moved down by a number of lines."""
+        line, col = self.index.split('.')
+        return EditOp(self.kind, f"{int(line) + lines}.{col}", self.text)
+
+    def apply(self, widget: tk.Text, reverse: bool = False) -> None:
+        """Perform the operation (or its inverse) on the widget."""
+        inserting = (self.kind == INSERT) != reverse
+        if inserting:
+            widget.insert(self.index, self.text)
+        else:
+            widget.delete(self.index, self.end_index())
+
+
+class TextChangeTracker:
+    """Intercepts insert/delete calls on a Tk text widget.
+
+    The widget's Tcl command is renamed and replaced by a Python proxy,
+    so every change (typing, paste, programmatic edits) is reported with
+    its exact index and text before it is applied.
+    """
+
+    def __init__(self, widget: tk.Text, on_change):
+        self.widget = widget
+        self.on_change = on_change
+        self._orig = widget._w + "_orig"
+        widget.tk.call("rename", widget._w, self._orig)
+        widget.tk.createcommand(widget._w, self._dispatch)
+
+    def _call(self, *args):
+        return self.widget.tk.call(self._orig, *args)
+
+    def _index(self, index: str) -> str:
+        # Nothing can be placed after the widget's final newline
+        if self.widget.tk.getboolean(self._call("compare", index, ">", "end-1c")):
+            index = "end-1c"
+        return self._call("index", index)
+
+    def _dispatch(self, operation, *args):
+        if operation == INSERT and len(args) >= 2:
+            index = self._index(args[0])
+            text = "".join(args[1::2])
+            if text:
+                self.on_change(EditOp(INSERT, index, text))
+            return self._call(operation, index, *args[1:])
+
+        if operation == DELETE and args:
+            # Multi-range deletes are applied one range at a time
+            ranges = list(zip(args[::2], args[1::2]))
+            if len(args) % 2:
+                ranges.append((args[-1], f"{args[-1]}+1c"))
+            resolved = [(self._index(start), self._index(end)) for start, end in ranges]
+            resolved.sort(key=lambda pair: tuple(map(int, pair[0].split('.'))), reverse=True)
+            for start, end in resolved:
+                text = self._call("get", start, end)
+                if text:
+                    self.on_change(EditOp(DELETE, start, text))
+                    self._call(DELETE, start, end)
+            return ""
+
+        if operation == "replace" and len(args) >= 3:
+            self._dispatch(DELETE, args[0], args[1])
+            return self._dispatch(INSERT, args[0], *args[2:])
+
+        return self._call(operation, *args)
+
+
+class EditHistory:
+    """Operation-based undo/redo history for a Tk text widget.
+
+    Only the inserted or deleted text of each edit is stored, so memory
+    grows with the size of the edits rather than the document. Runs of
+    single-character typing or deleting are coalesced into one step.
+
+    When the widget shows a window of a larger document, line_offset maps
+    widget lines to document lines and steps are stored in document
+    lines, so they survive paging; show_lines pages a step's lines back
+    in before it is undone or redone.
+    """
+
+    def __init__(self, widget: tk.Text, max_groups: int = MAX_UNDO_GROUPS,
+                 coalesce_seconds: float = COALESCE_SECONDS):
+        self.widget = widget
+        self.coalesce_seconds = coalesce_seconds
+        self.undo_stack = deque(maxlen=max_groups)
+        self.redo_stack = []
+        self._last_time = 0.0
+        self._group_depth = 0
+        self._applying = False
+        self._separate = True
+        self.version = 0  # Bumped by every change, including undo and redo
+        self.listeners = []  # Called with every EditOp, including undo and redo
+        self.line_offset = 0  # Document line shown on widget line 1, minus one
+        self.show_lines = None  # Pages in document lines (first, last) before undo/redo
+        self.tracker = TextChangeTracker(widget, self.record)
+
+    def record(self, op: EditOp) -> None:
+        """Add an operation reported by the change tracker."""
+        self.version += 1
+        for listener in self.listeners:
+            listener(op)
+        if self._applying:
+            return
+        if self.line_offset:
+            op = op.shifted(self.line_offset)
+        now = time.monotonic()
+        self.redo_stack.clear()
+
+        if self._group_depth:
+            if self._separate:
+                self.undo_stack.append([])
+                self._separate = False
+            self.undo_stack[-1].append(op)
+        elif not self._coalesce(op, now):
+            self.undo_stack.append([op])
+        self._last_time = now
+
+    def _coalesce(self, op: EditOp, now: float) -> bool:
+        """Merge a typed or deleted character into the previous step."""
+        if self._separate or not self.undo_stack:
+            self._separate = False
+            return False
+        if now - self._last_time > self.coalesce_seconds:
+            return False
+        group = self.undo_stack[-1]
+        last = group[-1]
+        if len(group) != 1 or len(op.text) != 1 or op.kind != last.kind or op.text == '\n':
+            return False
+
+        if op.kind == INSERT and op.index == last.end_index():
+            last.text += op.text
+            return True
+        if op.kind == DELETE:
+            if op.index == last.index:  # Forward delete
+                last.text += op.text
+                return True
+            if op.end_index() == last.index:  # Backspace
+                last.index = op.index
+                last.text = op.text + last.text
+                return True
+        return False
+
+    @contextmanager
+    def compound(self):
+        """Record every edit made inside the block as one undo step."""
+        if not self._group_depth:
+            self._separate = True
+        self._group_depth += 1
+        try:
+            yield
+        finally:
+            self._group_depth -= 1
+            if not self._group_depth:
+                self._separate = True
+
+    @contextmanager
+    def paused(self):
+        """Leave edits made inside the block out of the history, e.g. paging."""
+        applying, self._applying = self._applying, True
+        try:
+            yield
+        finally:
+            self._applying = applying
+
+    def separate(self) -> None:
+        """Force the next edit to start a new undo step."""
+        self._separate = True
+
+    def clear(self) -> None:
+        """Forget all undo and redo steps."""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._separate = True
+
+    def _apply(self, group: list, reverse: bool) -> tuple:
+        """Apply a step to the widget and return the touched line range."""
+        if self.show_lines is not None:
+            first = min(int(op.index.split('.')[0]) for op in group)
+            last = max(int(op.index.split('.')[0]) + op.text.count('\n') for op in group)
+            self.show_lines(first, last)
+        offset = -self.line_offset
+        ops = reversed(group) if reverse else group
+        lines = []
+        self._applying = True
+        try:
+            for op in ops:
+                op = op.shifted(offset)
+                op.apply(self.widget, reverse)
+                line = int(op.index.split('.')[0])
+                lines.append(line)
+                if (op.kind == INSERT) != reverse:
+                    lines.append(line + op.text.count('\n'))
+        finally:
+            self._applying = False
+            self._separate = True
+
+        cursor = (group[0] if reverse else group[-1]).shifted(offset)
+        if (cursor.kind == INSERT) != reverse:
+            self.widget.mark_set(tk.INSERT, cursor.end_index())
+        else:
+            self.widget.mark_set(tk.INSERT, cursor.index)
+        self.widget.see(tk.INSERT)
+        return min(lines), max(lines)
+
+    def undo(self):
+        """Revert the last step; return its line range or None."""
+        if not self.undo_stack:
+            return None
+        group = self.undo_stack.pop()
+        self.redo_stack.append(group)
+        return self._apply(group, reverse=True)
+
+    def redo(self):
+        """Reapply the last undone step; return its line range or None."""
+        if not self.redo_stack:
+            return None
+        group = self.redo_stack.pop()
+        self.undo_stack.append(group)
+        return self._apply(group, reverse=False)
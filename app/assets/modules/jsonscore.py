@@ -0,0 +1,135 @@
+import re
+from itertools import islice
+
+from app.assets.modules.parser import (
+    is_valid_frequency, frequency_error, is_valid_column_value, column_error
+)
+from app.assets.modules.sequence import NoteSequence
+
+# Streaming configuration constants
+CHUNK_SIZE = 1 << 16  # Characters read per chunk
+WRITE_BATCH = 10_000  # Notes serialized per write call
+MAX_ENTRY_LENGTH = 4096  # Unparsed text beyond this is reported as malformed
+
+_NUM = r'-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?'
+NOTES_START = re.compile(r'"notes"\s*:\s*\{')
+ENTRY_PATTERN = re.compile(
+    rf'\s*"(?P<key>[^"\\]*)"\s*:\s*\[\s*(?P<freq>{_NUM})\s*,\s*(?P<duration>{_NUM})\s*\]\s*(?P<sep>[,}}])'
+)
+EMPTY_PATTERN = re.compile(r'\s*}')
+
+
+def _to_int(literal: str) -> int:
+    return int(float(literal)) if any(c in literal for c in '.eE') else int(literal)
+
+
+def _validate(key: str, freq: str, duration: str) -> tuple:
+    """Convert one JSON entry to a (index, freq, duration) triple."""
+    try:
+        note = (int(key), _to_int(freq), _to_int(duration))
+    except ValueError:
+        raise ValueError(f"Invalid note entry: {key!r}")
+    if not is_valid_column_value(note[0]):
+        raise ValueError(column_error("Note index", note[0]))
+    if not is_valid_frequency(note[1]):
+        raise ValueError(f"{frequency_error(note[1])} for note {key}")
+    if not is_valid_column_value(note[2]):
+        raise ValueError(f"{column_error('Duration', note[2])} for note {key}")
+    return note
+
+
+def iter_json_notes(file, chunk_size: int = CHUNK_SIZE, progress=None):
+    """Stream (index, freq, duration) triples from a {"notes": {...}} file.
+
+    The file is read in fixed-size chunks and entries are matched
+    straight out of the buffer, so memory stays proportional to the
+    chunk size. progress, if given, is called with the number of
+    characters consumed so far.
+    """
+    buffer = ""
+    consumed = 0
+    eof = False
+
+    def fill():
+        nonlocal buffer, eof
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer += chunk
+
+    # Locate the start of the notes object
+    while True:
+        match = NOTES_START.search(buffer)
+        if match:
+            pos = match.end()
+            break
+        if eof:
+            raise ValueError("Missing \"notes\" object")
+        # Keep a tail in case the marker is split across chunks
+        consumed += max(len(buffer) - 32, 0)
+        buffer = buffer[-32:]
+        fill()
+
+    if EMPTY_PATTERN.match(buffer, pos) is None and not eof:
+        fill()
+    if EMPTY_PATTERN.match(buffer, pos):
+        return
+
+    while True:
+        match = ENTRY_PATTERN.match(buffer, pos)
+        if match is None:
+            if eof or len(buffer) - pos > MAX_ENTRY_LENGTH:
+                raise ValueError(f"Malformed note entry near character {consumed + pos}")
+            # Drop the parsed prefix and read more
+            consumed += pos
+            buffer = buffer[pos:]
+            pos = 0
+            fill()
+            if progress:
+                progress(consumed)
+            continue
+        yield _validate(match.group('key'), match.group('freq'), match.group('duration'))
+        pos = match.end()
+        if match.group('sep') == '}':
+            if progress:
+                progress(consumed + pos)
+            return
+
+
+def read_json_notes(path: str, progress=None) -> dict:
+    """Load a JSON score into a notes dict."""
+    with open(path, 'r', encoding='utf-8') as file:
+        return {key: (freq, duration)
+                for key, freq, duration in iter_json_notes(file, progress=progress)}
+
+
+def read_json_sequence(path: str, progress=None) -> NoteSequence:
+    """Load a JSON score straight into NoteSequence columns."""
+    indices, freqs, durations = [], [], []
+    with open(path, 'r', encoding='utf-8') as file:
+        for key, freq, duration in iter_json_notes(file, progress=progress):
+            indices.append(key)
+            freqs.append(freq)
+            durations.append(duration)
+    return NoteSequence(indices, freqs, durations)
+
+
+def write_json_notes(path: str, notes) -> None:
+    """Write a score as {"notes": {...}} JSON in batched writes."""
+    items = iter(notes.items())
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('{\n    "notes": {')
+        first = True
+        while True:
+            batch = [
+                f'\n        "{k}": [{freq}, {duration}]'
+                for k, (freq, duration) in islice(items, WRITE_BATCH)
+            ]
+            if not batch:
+                break
+            if not first:
+                file.write(',')
+            file.write(','.join(batch))
+            first = False
+        file.write('\n    }\n}\n' if not first else '}\n}\n')
+
@@ -0,0 +1,183 @@
+import tkinter as tk
+
+# UI configuration constants
+WHITE_KEY_COLOR = "#F8F9FA"
+BLACK_KEY_COLOR = "#2B2B2B"
+ACTIVE_WHITE_COLOR = "#E2E6EA"
+ACTIVE_BLACK_COLOR = "#404040"
+PRESSED_WHITE_COLOR = "#A8D8EA"
+PRESSED_BLACK_COLOR = "#2E6F8E"
+OUTLINE_COLOR = "#6C757D"
+FONT_FAMILY = "Consolas"
+FONT_SIZE = 7
+
+# Key geometry in pixels
+WHITE_KEY_WIDTH = 18
+WHITE_KEY_HEIGHT = 150
+BLACK_KEY_WIDTH = 11
+BLACK_KEY_HEIGHT = 95
+
+# Default range: the 88 keys of a piano, A0 to C8, as MIDI note numbers
+FIRST_KEY = 21
+LAST_KEY = 108
+
+NOTE_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+BLACK_PITCHES = {1, 3, 6, 8, 10}
+
+
+def key_number(note_name: str, octave: int) -> int:
+    """MIDI note number of a note name in an octave (C4 = 60)."""
+    return (octave + 1) * 12 + NOTE_NAMES.index(note_name)
+
+
+def key_name(number: int) -> tuple:
+    """(note name, octave) of a MIDI note number."""
+    return NOTE_NAMES[number % 12], number // 12 - 1
+
+
+def is_black(number: int) -> bool:
+    """Whether a MIDI note is a black key."""
+    return number % 12 in BLACK_PITCHES
+
+
+class PianoKeyboard(tk.Canvas):
+    """Multi-octave keyboard drawn as rectangles on one canvas.
+
+    Key geometry is computed once, so mapping a click to a key is two
+    table lookups rather than a search, and pressing a key recolors only
+    its own rectangle. The widget count stays at one whatever the range.
+    """
+
+    def __init__(self, master, on_press=None, on_release=None,
+                 first: int = FIRST_KEY, last: int = LAST_KEY, **kwargs):
+        if is_black(first) or is_black(last) or first >= last:
+            raise ValueError("Keyboard range must start and end on white keys")
+        self.first = first
+        self.last = last
+        self.on_press = on_press  # on_press(number) -> handle
+        self.on_release = on_release  # on_release(handle)
+
+        # white_keys[i] is the note of the i-th white key; black_keys[i] is
+        # the black key centred on the boundary left of white key i, if any
+        self.white_keys = [n for n in range(first, last + 1) if not is_black(n)]
+        self.black_keys = [None] * (len(self.white_keys) + 1)
+        for i, number in enumerate(self.white_keys[1:], start=1):
+            if is_black(number - 1):
+                self.black_keys[i] = number - 1
+
+        width = len(self.white_keys) * WHITE_KEY_WIDTH
+        super().__init__(master, width=width, height=WHITE_KEY_HEIGHT,
+                         highlightthickness=0, bg=OUTLINE_COLOR, **kwargs)
+
+        self.items = {}  # note -> canvas rectangle
+        self.pressed = {}  # note -> number of active presses
+        self.draw()
+
+        self._mouse_key = None
+        self._mouse_handle = None
+        self.bind("<ButtonPress-1>", self.mouse_press)
+        self.bind("<B1-Motion>", self.mouse_drag)
+        self.bind("<ButtonRelease-1>", self.mouse_release)
+
+    def draw(self) -> None:
+        """Draw every key once; later updates only recolor them."""
+        for i, number in enumerate(self.white_keys):
+            x = i * WHITE_KEY_WIDTH
+            self.items[number] = self.create_rectangle(
+                x, 0, x + WHITE_KEY_WIDTH, WHITE_KEY_HEIGHT,
+                fill=WHITE_KEY_COLOR, outline=OUTLINE_COLOR
+            )
+            name, octave = key_name(number)
+            if name == "C":
+                self.create_text(x + WHITE_KEY_WIDTH // 2, WHITE_KEY_HEIGHT - 10,
+                                 text=f"C{octave}", fill=BLACK_KEY_COLOR,
+                                 font=(FONT_FAMILY, FONT_SIZE))
+        for i, number in enumerate(self.black_keys):
+            if number is None:
+                continue
+            x = i * WHITE_KEY_WIDTH - BLACK_KEY_WIDTH // 2
+            self.items[number] = self.create_rectangle(
+                x, 0, x + BLACK_KEY_WIDTH, BLACK_KEY_HEIGHT,
+                fill=BLACK_KEY_COLOR, outline=BLACK_KEY_COLOR
+            )
+
+    def key_at(self, x: int, y: int):
+        """Return the note under a canvas point, or None."""
+        if not 0 <= x < len(self.white_keys) * WHITE_KEY_WIDTH or not 0 <= y < WHITE_KEY_HEIGHT:
+            return None
+        if y < BLACK_KEY_HEIGHT:
+            boundary = (x + WHITE_KEY_WIDTH // 2) // WHITE_KEY_WIDTH
+            black = self.black_keys[boundary]
+            if black is not None and abs(x - boundary * WHITE_KEY_WIDTH) <= BLACK_KEY_WIDTH // 2:
+                return black
+        return self.white_keys[x // WHITE_KEY_WIDTH]
+
+    def _recolor(self, number: int) -> None:
+        """Paint a key in its pressed or released color."""
+        down = self.pressed.get(number, 0) > 0
+        if is_black(number):
+            color = PRESSED_BLACK_COLOR if down else BLACK_KEY_COLOR
+        else:
+            color = PRESSED_WHITE_COLOR if down else WHITE_KEY_COLOR
+        self.itemconfigure(self.items[number], fill=color)
+
+    def press_key(self, number: int) -> None:
+        """Show a key as pressed; presses from several sources are counted."""
+        if number not in self.items:
+            return
+        count = self.pressed.get(number, 0)
+        self.pressed[number] = count + 1
+        if count == 0:
+            self._recolor(number)
+
+    def release_key(self, number: int) -> None:
+        """Undo one press_key() call."""
+        count = self.pressed.get(number, 0)
+        if count == 0:
+            return
+        if count == 1:
+            del self.pressed[number]
+            self._recolor(number)
+        else:
+            self.pressed[number] = count - 1
+
+    def show_keys(self, numbers) -> None:
+        """Show exactly the given keys as pressed, recoloring only changes.
+
+        Meant for playback visualisation, where the set of sounding notes
+        is replaced as a whole.
+        """
+        numbers = {n for n in numbers if n in self.items}
+        for number in [n for n in self.pressed if n not in numbers]:
+            del self.pressed[number]
+            self._recolor(number)
+        for number in numbers:
+            if number not in self.pressed:
+                self.pressed[number] = 1
+                self._recolor(number)
+
+    def mouse_press(self, event):
+        """Start the note under the pointer."""
+        self._start_mouse_key(self.key_at(event.x, event.y))
+
+    def mouse_drag(self, event):
+        """Slide between keys while the button is held."""
+        number = self.key_at(event.x, event.y)
+        if number != self._mouse_key:
+            self._stop_mouse_key()
+            self._start_mouse_key(number)
+
+    def mouse_release(self, event):
+        """Stop the note started with the mouse."""
+        self._stop_mouse_key()
+
+    def _start_mouse_key(self, number):
+        self._mouse_key = number
+        if number is not None and self.on_press:
+            self._mouse_handle = self.on_press(number)
+
+    def _stop_mouse_key(self):
+        if self._mouse_key is not None and self.on_release:
+            self.on_release(self._mouse_handle)
+        self._mouse_key = None
+        self._mouse_handle = None
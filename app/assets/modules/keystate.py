@@ -0,0 +1,76 @@
+# Delay before a key release is trusted, in milliseconds. X11 auto-repeat
+# sends release/press pairs back to back; a press inside this window
+# cancels the pending release instead of retriggering the note.
+RELEASE_DEBOUNCE_MS = 30
+
+
+class KeyTracker:
+    """Turns raw key events into note-on/note-off calls.
+
+    Auto-repeat is filtered out in both forms Tk delivers it: repeated
+    presses without a release (Windows) and release/press pairs (X11).
+    While the sustain pedal is down, released notes keep sounding until
+    the pedal is lifted.
+    """
+
+    def __init__(self, widget, note_on, note_off,
+                 debounce_ms: int = RELEASE_DEBOUNCE_MS):
+        self.widget = widget
+        self.note_on = note_on  # note_on(key) -> handle
+        self.note_off = note_off  # note_off(handle)
+        self.debounce_ms = debounce_ms
+
+        self.held = {}  # key -> handle of the sounding note
+        self.sustained = []  # handles kept alive by the pedal
+        self.pedal = False
+        self._pending = {}  # key -> after() id of a debounced release
+
+    def press(self, key) -> bool:
+        """Start a note unless the key is already down; return True if started."""
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            self.widget.after_cancel(pending)
+            return False
+        if key in self.held:
+            return False
+        self.held[key] = self.note_on(key)
+        return True
+
+    def release(self, key) -> None:
+        """Schedule the release of a key, unless auto-repeat re-presses it."""
+        if key in self.held and key not in self._pending:
+            self._pending[key] = self.widget.after(self.debounce_ms, self._release, key)
+
+    def _release(self, key) -> None:
+        """Stop a key's note, or hand it to the pedal."""
+        self._pending.pop(key, None)
+        handle = self.held.pop(key, None)
+        if handle is None:
+            return
+        if self.pedal:
+            self.sustained.append(handle)
+        else:
+            self.note_off(handle)
+
+    def pedal_down(self) -> None:
+        """Hold every released note until pedal_up()."""
+        self.pedal = True
+
+    def pedal_up(self) -> None:
+        """Release the notes the pedal was holding."""
+        self.pedal = False
+        for handle in self.sustained:
+            self.note_off(handle)
+        self.sustained.clear()
+
+    def release_all(self) -> None:
+        """Stop every held and sustained note, e.g. when focus is lost."""
+        for pending in self._pending.values():
+            self.widget.after_cancel(pending)
+        self._pending.clear()
+        for handle in self.held.values():
+            if handle is not None:
+                self.note_off(handle)
+        self.held.clear()
+        self.pedal = False
+        self.pedal_up()
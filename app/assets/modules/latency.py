@@ -0,0 +1,165 @@
+import threading
+import time
+import tkinter as tk
+from array import array
+from tkinter import ttk
+
+# csv, json and filedialog are imported on export to keep startup lean
+
+# Timestamped stages of the key-to-sound path, in order
+STAGE_KEY = 0  # <KeyPress> received by handle_key_press
+STAGE_LOOKUP = 1  # Frequency resolved
+STAGE_QUEUED = 2  # Note accepted by the voice pool
+STAGE_START = 3  # Voice worker hands the note to the backend
+STAGES = ("key", "lookup", "queued", "start")
+
+DEFAULT_CAPACITY = 4096  # Keypresses kept in the ring buffer
+OVERLAY_REFRESH_MS = 500
+PERCENTILES = (50, 95, 99)
+
+# Overlay styling
+OVERLAY_BG = "#1E1E1E"
+OVERLAY_FG = "#4EC9B0"
+FONT_FAMILY = "Consolas"
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = min(int(round(pct / 100 * (len(values) - 1))), len(values) - 1)
+    return values[rank]
+
+
+class LatencyProbe:
+    """Records key-to-sound stage timestamps in a preallocated ring buffer.
+
+    begin() claims a slot for a keypress and mark() writes a
+    perf_counter() value into it, so instrumentation costs one clock read
+    and one array store per stage. The oldest keypresses are overwritten
+    once the buffer is full.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, enabled: bool = True):
+        self.capacity = capacity
+        self.enabled = enabled
+        self._stamps = array('d', bytes(8 * capacity * len(STAGES)))
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def begin(self) -> int:
+        """Start a keypress record and return its slot, or -1 if disabled."""
+        if not self.enabled:
+            return -1
+        with self._lock:
+            slot = self._next % self.capacity
+            self._next += 1
+        base = slot * len(STAGES)
+        for stage in range(1, len(STAGES)):
+            self._stamps[base + stage] = 0.0
+        self._stamps[base] = time.perf_counter()
+        return slot
+
+    def mark(self, slot: int, stage: int) -> None:
+        """Timestamp a stage of a keypress record."""
+        if slot >= 0:
+            self._stamps[slot * len(STAGES) + stage] = time.perf_counter()
+
+    def records(self) -> list:
+        """Return completed records as per-stage offsets from the keypress, in ms."""
+        count = min(self._next, self.capacity)
+        stages = len(STAGES)
+        rows = []
+        for slot in range(count):
+            base = slot * stages
+            stamps = self._stamps[base:base + stages]
+            if not all(stamps):
+                continue
+            rows.append([(stamp - stamps[0]) * 1000.0 for stamp in stamps])
+        return rows
+
+    def summary(self) -> dict:
+        """Percentiles of each stage's offset from the keypress, in ms."""
+        rows = self.records()
+        result = {"samples": len(rows)}
+        for stage in range(1, len(STAGES)):
+            values = sorted(row[stage] for row in rows)
+            result[STAGES[stage]] = {f"p{pct}": percentile(values, pct) for pct in PERCENTILES}
+        return result
+
+    def export_csv(self, path: str) -> None:
+        """Write every completed record as CSV, one keypress per row."""
+        import csv
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow([f"{stage}_ms" for stage in STAGES])
+            writer.writerows(self.records())
+
+    def export_json(self, path: str) -> None:
+        """Write the summary and every completed record as JSON."""
+        import json
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({
+                "stages": STAGES,
+                "summary": self.summary(),
+                "records": self.records(),
+            }, file, indent=4)
+
+    def reset(self) -> None:
+        """Forget all recorded keypresses."""
+        with self._lock:
+            self._next = 0
+
+
+class LatencyOverlay(tk.Toplevel):
+    """Small always-on-top window showing live key-to-sound percentiles."""
+
+    def __init__(self, master, probe: LatencyProbe):
+        super().__init__(master)
+        self.probe = probe
+        self.title("WinPiano: Latency")
+        self.configure(bg=OVERLAY_BG)
+        self.attributes('-topmost', True)
+        self.resizable(False, False)
+
+        self.label = tk.Label(self, bg=OVERLAY_BG, fg=OVERLAY_FG, justify='left',
+                              font=(FONT_FAMILY, 10))
+        self.label.pack(padx=10, pady=(10, 5))
+        buttons = ttk.Frame(self)
+        buttons.pack(pady=(0, 10))
+        ttk.Button(buttons, text="Export", command=self.export).pack(side='left', padx=5)
+        ttk.Button(buttons, text="Reset", command=self.probe.reset).pack(side='left', padx=5)
+        self._refresh_job = None
+        self.refresh()
+
+    def refresh(self):
+        """Redraw the percentile table and schedule the next refresh."""
+        summary = self.probe.summary()
+        lines = [f"{'stage':<8}" + "".join(f"{f'p{pct}':>9}" for pct in PERCENTILES)]
+        for stage in STAGES[1:]:
+            values = summary[stage]
+            lines.append(f"{stage:<8}" + "".join(f"{values[f'p{pct}']:>7.2f}ms" for pct in PERCENTILES))
+        lines.append(f"samples: {summary['samples']}")
+        self.label.configure(text="\n".join(lines))
+        self._refresh_job = self.after(OVERLAY_REFRESH_MS, self.refresh)
+
+    def destroy(self):
+        """Cancel the pending refresh so it never runs on a dead widget."""
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        super().destroy()
+
+    def export(self):
+        """Save the recorded latencies as CSV or JSON."""
+        from tkinter import filedialog
+        filepath = filedialog.asksaveasfilename(
+            parent=self,
+            title="Export Latency",
+            filetypes=[("CSV Files", "*.csv"), ("JSON Files", "*.json")],
+            defaultextension=".csv"
+        )
+        if filepath.endswith('.json'):
+            self.probe.export_json(filepath)
+        elif filepath:
+            self.probe.export_csv(filepath)
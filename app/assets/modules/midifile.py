@@ -0,0 +1,272 @@
+import heapq
+import math
+import mmap
+import os
+import struct
+from array import array
+
+from app.assets.modules.sequence import REST_FREQUENCY, NoteSequence, playable_frequency
+
+MIDI_EXTENSIONS = (".mid", ".midi")
+
+# Chunk layouts
+HEADER_CHUNK = b"MThd"
+TRACK_CHUNK = b"MTrk"
+CHUNK_HEADER = struct.Struct(">4sI")  # type, length
+FILE_HEADER = struct.Struct(">HHH")  # format, track count, division
+
+# Export timing: 1000 ticks per quarter at 1,000,000 us per quarter is
+# exactly one tick per millisecond
+EXPORT_DIVISION = 1000
+EXPORT_TEMPO = 1_000_000
+DEFAULT_TEMPO = 500_000  # us per quarter note until a tempo event says otherwise
+MAX_VARLEN = 0x0FFFFFFF  # Largest variable-length quantity, about 74 hours in ticks
+EXPORT_VELOCITY = 96
+WRITE_BATCH = 10_000  # Notes encoded per write call
+DRUM_CHANNEL = 9  # General MIDI percussion, skipped on import by default
+
+# Event kinds, ordered so tempo changes and note-offs sort before
+# note-ons at the same tick
+TEMPO = 0
+NOTE_OFF = 1
+NOTE_ON = 2
+
+# Frequency of every MIDI note; notes below the beeper range are moved
+# up by octaves so they stay playable
+NOTE_FREQUENCIES = [playable_frequency(440.0 * 2 ** ((number - 69) / 12))
+                    for number in range(128)]
+
+
+class MidiError(ValueError):
+    """Raised when a MIDI file is malformed or unsupported."""
+
+
+def frequency_to_note(frequency: int) -> int:
+    """Nearest MIDI note number for a frequency."""
+    number = int(round(69 + 12 * math.log2(frequency / 440.0)))
+    return max(0, min(number, 127))
+
+
+def _read_varlen(data, pos: int) -> tuple:
+    """Decode a variable-length quantity; return (value, next position)."""
+    value = 0
+    for _ in range(4):
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos
+    raise MidiError(f"Variable-length value too long at byte {pos}")
+
+
+def _encode_varlen(value: int) -> bytes:
+    """Encode a variable-length quantity, at most MAX_VARLEN."""
+    if value > MAX_VARLEN:
+        raise MidiError(f"Delta time {value} is too long for MIDI (max {MAX_VARLEN} ms)")
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(reversed(out))
+
+
+def _track_events(data, start: int, end: int, track: int):
+    """Yield (tick, kind, track, value, channel) for one track chunk.
+
+    Only tempo changes and note events are reported; everything else is
+    skipped in place, honouring running status. Events running past the
+    end of the chunk raise MidiError.
+    """
+    try:
+        yield from _decode_track(data, start, end, track)
+    except IndexError:
+        raise MidiError(f"Track {track} is truncated") from None
+
+
+def _decode_track(data, start: int, end: int, track: int):
+    pos = start
+    tick = 0
+    status = 0
+    while pos < end:
+        delta, pos = _read_varlen(data, pos)
+        tick += delta
+        if data[pos] & 0x80:
+            status = data[pos]
+            pos += 1
+        elif not status:
+            raise MidiError(f"Data byte without status in track {track} at byte {pos}")
+
+        if status == 0xFF:
+            meta = data[pos]
+            length, pos = _read_varlen(data, pos + 1)
+            if pos + length > end:
+                raise MidiError(f"Track {track} is truncated")
+            if meta == 0x51 and length == 3:
+                yield tick, TEMPO, track, int.from_bytes(data[pos:pos + 3], 'big'), 0
+            pos += length
+            status = 0
+            if meta == 0x2F:  # End of track
+                return
+        elif status in (0xF0, 0xF7):
+            length, pos = _read_varlen(data, pos)
+            pos += length
+            status = 0
+        else:
+            kind = status & 0xF0
+            channel = status & 0x0F
+            if kind in (0x80, 0x90):
+                number, velocity = data[pos], data[pos + 1]
+                pos += 2
+                if kind == 0x90 and velocity:
+                    yield tick, NOTE_ON, track, number, channel
+                else:
+                    yield tick, NOTE_OFF, track, number, channel
+            elif kind in (0xC0, 0xD0):
+                pos += 1
+            else:
+                pos += 2
+        if pos > end:
+            raise MidiError(f"Track {track} is truncated")
+
+
+def _track_ranges(data) -> tuple:
+    """Parse the header; return (division, [(start, end), ...]) of the tracks."""
+    if len(data) < CHUNK_HEADER.size + FILE_HEADER.size:
+        raise MidiError("File is too short for a MIDI header")
+    kind, length = CHUNK_HEADER.unpack_from(data, 0)
+    if kind != HEADER_CHUNK or length < FILE_HEADER.size:
+        raise MidiError("Not a Standard MIDI File")
+    fmt, count, division = FILE_HEADER.unpack_from(data, CHUNK_HEADER.size)
+    if fmt not in (0, 1):
+        raise MidiError(f"Unsupported MIDI format {fmt}, only types 0 and 1 are read")
+
+    tracks = []
+    pos = CHUNK_HEADER.size + length
+    while pos + CHUNK_HEADER.size <= len(data) and len(tracks) < count:
+        kind, length = CHUNK_HEADER.unpack_from(data, pos)
+        pos += CHUNK_HEADER.size
+        if kind == TRACK_CHUNK:
+            tracks.append((pos, min(pos + length, len(data))))
+        pos += length
+    return division, tracks
+
+
+def iter_midi_notes(path: str, skip_drums: bool = True):
+    """Stream (frequency, duration) pairs from a type 0 or 1 MIDI file.
+
+    Tracks are decoded lazily straight from a memory map and merged by
+    time, so memory stays proportional to the number of tracks rather
+    than the number of events. The score format plays one note at a
+    time, so overlapping notes are reduced to their top line: a chord
+    keeps its highest note and a held note is cut at the next onset.
+    Gaps become rests. Durations are rounded on the absolute timeline,
+    so rounding never accumulates into drift.
+    """
+    with open(path, 'rb') as file:
+        if not os.fstat(file.fileno()).st_size:
+            raise MidiError("File is too short for a MIDI header")
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    with data:
+        division, tracks = _track_ranges(data)
+        if division & 0x8000:
+            # SMPTE: frames per second and ticks per frame
+            ms_per_tick = 1000.0 / ((256 - (division >> 8)) * (division & 0xFF))
+            tempo_scale = None
+        else:
+            tempo_scale = 1.0 / (1000.0 * division)  # ms per tick per us/quarter
+            ms_per_tick = DEFAULT_TEMPO * tempo_scale
+
+        base_tick = 0
+        base_ms = 0.0
+        position = 0  # Milliseconds already emitted
+        current = None  # [start tick, start ms, note, channel, end ms]
+
+        def emit(note, start_ms, end_ms):
+            nonlocal position
+            start, end = round(start_ms), round(end_ms)
+            if start > position:
+                yield REST_FREQUENCY, start - position
+                position = start
+            if end > position:
+                yield NOTE_FREQUENCIES[note], end - position
+                position = end
+
+        streams = [_track_events(data, start, end, i) for i, (start, end) in enumerate(tracks)]
+        for tick, kind, _, value, channel in heapq.merge(*streams):
+            now = base_ms + (tick - base_tick) * ms_per_tick
+            if kind == TEMPO:
+                if tempo_scale is not None:
+                    base_tick, base_ms = tick, now
+                    ms_per_tick = value * tempo_scale
+            elif skip_drums and channel == DRUM_CHANNEL:
+                continue
+            elif kind == NOTE_ON:
+                if current is not None and current[0] == tick:
+                    if value > current[2]:
+                        current[2], current[3] = value, channel
+                    continue
+                if current is not None:
+                    end = now if current[4] is None else min(current[4], now)
+                    yield from emit(current[2], current[1], end)
+                current = [tick, now, value, channel, None]
+            elif current is not None and current[4] is None \
+                    and value == current[2] and channel == current[3]:
+                current[4] = now
+
+        if current is not None and current[4] is not None:
+            yield from emit(current[2], current[1], current[4])
+
+
+def read_midi(path: str, skip_drums: bool = True) -> NoteSequence:
+    """Load a MIDI file as a NoteSequence numbered from 1."""
+    frequencies = array('I')
+    durations = array('I')
+    for freq, duration in iter_midi_notes(path, skip_drums):
+        frequencies.append(freq)
+        durations.append(duration)
+    return NoteSequence.from_columns(range(1, len(frequencies) + 1), frequencies, durations)
+
+
+def write_midi(path: str, notes) -> None:
+    """Write a {index: (freq, duration)} score as a type 0 MIDI file.
+
+    Events are encoded in batches and the track length is patched in at
+    the end, so the score is never held in memory as MIDI bytes.
+    """
+    sequence = NoteSequence.from_dict(notes)
+    with open(path, 'wb') as file:
+        file.write(CHUNK_HEADER.pack(HEADER_CHUNK, FILE_HEADER.size))
+        file.write(FILE_HEADER.pack(0, 1, EXPORT_DIVISION))
+        length_pos = file.tell() + 4
+        file.write(CHUNK_HEADER.pack(TRACK_CHUNK, 0))
+        track_start = file.tell()
+
+        # Tempo meta event, then notes as note-on / note-on velocity 0 pairs
+        # so running status applies throughout
+        file.write(b"\x00\xFF\x51\x03" + EXPORT_TEMPO.to_bytes(3, 'big'))
+        buffer = bytearray()
+        status_written = False
+        rest = 0
+        for count, (freq, duration) in enumerate(zip(sequence.frequencies, sequence.durations), 1):
+            if freq == REST_FREQUENCY:
+                rest += duration
+                continue
+            number = frequency_to_note(freq)
+            buffer += _encode_varlen(rest)
+            if not status_written:
+                buffer.append(0x90)
+                status_written = True
+            buffer += bytes((number, EXPORT_VELOCITY))
+            buffer += _encode_varlen(duration)
+            buffer += bytes((number, 0))
+            rest = 0
+            if count % WRITE_BATCH == 0:
+                file.write(buffer)
+                buffer.clear()
+        buffer += _encode_varlen(rest) + b"\xFF\x2F\x00"
+        file.write(buffer)
+
+        track_length = file.tell() - track_start
+        file.seek(length_pos)
+        file.write(struct.pack(">I", track_length))
@@ -0,0 +1,237 @@
+import threading
+
+import numpy as np
+
+from app.assets.modules.audio import (
+    AudioBackend, SAMPLE_RATE, MAX_AMPLITUDE, DEFAULT_VOLUME, FADE_MS
+)
+from app.assets.modules.stream import OutputStream, DEFAULT_BUFFER_FRAMES, default_sink
+
+# Mixer configuration defaults
+DEFAULT_BLOCK_SIZE = 256  # samples per block, ~5.8 ms at 44.1 kHz
+DEFAULT_MAX_VOICES = 32
+DEFAULT_DRIVE = 1.0  # Gain into the soft clipper
+
+
+class Voice:
+    """One sounding note: an oscillator or a pre-rendered sample buffer."""
+
+    __slots__ = ("id", "step", "phase", "samples", "position", "remaining",
+                 "gain", "release", "frequency")
+
+    def __init__(self, voice_id: int, frequency: int, remaining: int, gain: float,
+                 step: float = 0.0, samples: np.ndarray = None):
+        self.id = voice_id
+        self.frequency = frequency
+        self.step = step  # Phase increment per sample
+        self.phase = 0.0
+        self.samples = samples  # float32 in [-1, 1], or None for an oscillator
+        self.position = 0  # Samples rendered so far
+        self.remaining = remaining  # Samples left, or -1 while held
+        self.gain = gain
+        self.release = -1  # Samples left in the release fade, -1 if not releasing
+
+
+class Mixer:
+    """Sums active voices block by block into 16-bit PCM.
+
+    Each block costs one vectorized pass per active voice, so CPU grows
+    linearly with polyphony. Voices get a short attack and release ramp,
+    are scaled by their own gain and the master volume, and the sum goes
+    through a tanh soft clipper so chords saturate instead of wrapping.
+    Smaller blocks lower latency at the price of more per-block overhead.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE,
+                 block_size: int = DEFAULT_BLOCK_SIZE,
+                 max_voices: int = DEFAULT_MAX_VOICES,
+                 volume: float = DEFAULT_VOLUME,
+                 drive: float = DEFAULT_DRIVE):
+        if block_size < 1:
+            raise ValueError("Block size must be at least one sample")
+        if max_voices < 1:
+            raise ValueError("Mixer needs at least one voice")
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.max_voices = max_voices
+        self.volume = volume
+        self.drive = drive
+        self.fade_len = max(int(sample_rate * FADE_MS / 1000), 1)
+
+        self.voices = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        # Scratch buffers reused for every block
+        self._ramp = np.arange(block_size, dtype=np.float64)
+        self._mix = np.zeros(block_size, dtype=np.float64)
+        self._chunk = np.zeros(block_size, dtype=np.float64)
+
+    def _add(self, voice: Voice) -> int:
+        """Register a voice, stealing the oldest one if the mixer is full."""
+        with self._lock:
+            if len(self.voices) >= self.max_voices:
+                del self.voices[next(iter(self.voices))]
+            self.voices[voice.id] = voice
+        return voice.id
+
+    def _new_id(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def note_on(self, frequency: int, duration: int = None, gain: float = 1.0) -> int:
+        """Start a sine voice; without a duration it sounds until note_off()."""
+        remaining = -1 if duration is None else int(self.sample_rate * duration / 1000)
+        step = 2 * np.pi * frequency / self.sample_rate
+        return self._add(Voice(self._new_id(), frequency, remaining, gain, step=step))
+
+    def play_buffer(self, samples, gain: float = 1.0) -> int:
+        """Start a voice from pre-rendered 16-bit PCM samples."""
+        buffer = np.asarray(samples, dtype=np.float32) / MAX_AMPLITUDE
+        return self._add(Voice(self._new_id(), 0, len(buffer), gain, samples=buffer))
+
+    def note_off(self, voice_id: int) -> None:
+        """Release a voice with a short fade instead of a click."""
+        with self._lock:
+            voice = self.voices.get(voice_id)
+            if voice is not None and voice.release < 0:
+                voice.release = self.fade_len
+
+    def set_gain(self, voice_id: int, gain: float) -> None:
+        """Change the gain of a sounding voice."""
+        with self._lock:
+            voice = self.voices.get(voice_id)
+            if voice is not None:
+                voice.gain = gain
+
+    def active_voices(self) -> int:
+        """Number of voices currently sounding."""
+        return len(self.voices)
+
+    def render_block(self, frames: int = None) -> np.ndarray:
+        """Mix the next block of every active voice into int16 samples."""
+        frames = frames or self.block_size
+        if frames > len(self._ramp):
+            self._ramp = np.arange(frames, dtype=np.float64)
+            self._mix = np.zeros(frames, dtype=np.float64)
+            self._chunk = np.zeros(frames, dtype=np.float64)
+        ramp = self._ramp[:frames]
+        mix = self._mix[:frames]
+        chunk = self._chunk[:frames]
+        mix.fill(0.0)
+
+        with self._lock:
+            finished = []
+            for voice in self.voices.values():
+                count = frames
+                if voice.remaining >= 0:
+                    count = min(count, voice.remaining)
+                if voice.release >= 0:
+                    count = min(count, voice.release)
+                if count <= 0:
+                    finished.append(voice.id)
+                    continue
+                part = chunk[:count]
+
+                if voice.samples is None:
+                    np.multiply(ramp[:count], voice.step, out=part)
+                    part += voice.phase
+                    np.sin(part, out=part)
+                    voice.phase = (voice.phase + voice.step * count) % (2 * np.pi)
+                else:
+                    part[:] = voice.samples[voice.position:voice.position + count]
+
+                # Attack ramp for oscillators (buffers carry their own fades)
+                if voice.samples is None and voice.position < self.fade_len:
+                    part *= np.minimum((ramp[:count] + voice.position) / self.fade_len, 1.0)
+                # Fade-out at the end of a timed oscillator note
+                if voice.samples is None and voice.remaining >= 0 \
+                        and voice.remaining - count < self.fade_len:
+                    part *= np.clip((voice.remaining - ramp[:count]) / self.fade_len, 0.0, 1.0)
+                if voice.release >= 0:
+                    part *= (voice.release - ramp[:count]) / self.fade_len
+                    voice.release -= count
+
+                part *= voice.gain
+                mix[:count] += part
+                voice.position += count
+                if voice.remaining >= 0:
+                    voice.remaining -= count
+                if voice.remaining == 0 or voice.release == 0:
+                    finished.append(voice.id)
+            for voice_id in finished:
+                del self.voices[voice_id]
+
+        # Soft clipping keeps summed chords within range without wrapping
+        np.tanh(mix * self.drive, out=chunk)
+        chunk *= MAX_AMPLITUDE * self.volume
+        return chunk.astype(np.int16)
+
+
+class MixerBackend(AudioBackend):
+    """Polyphonic backend: every note becomes a voice on one mixed stream.
+
+    play() and play_samples() return immediately, so a voice pool or the
+    scheduler can start any number of overlapping notes. A render thread
+    keeps the output stream's ring buffer topped up one block at a time;
+    the sink (sound card, WAV file or null) pulls from the other end.
+    """
+
+    name = "mixer"
+    accepts_samples = True
+    supports_hold = True
+
+    def __init__(self, path: str = None, sink=None,
+                 sample_rate: int = SAMPLE_RATE,
+                 block_size: int = DEFAULT_BLOCK_SIZE,
+                 buffer_frames: int = DEFAULT_BUFFER_FRAMES,
+                 max_voices: int = DEFAULT_MAX_VOICES,
+                 volume: float = DEFAULT_VOLUME):
+        self.mixer = Mixer(sample_rate, block_size, max_voices, volume)
+        self.stream = OutputStream(sink or default_sink(path), sample_rate,
+                                   buffer_frames, block_size)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="mixer", daemon=True)
+        self._thread.start()
+
+    def play(self, frequency: int, duration: int) -> None:
+        """Start a voice for the tone without waiting for it to end."""
+        self.mixer.note_on(frequency, duration)
+
+    def play_samples(self, samples, sample_rate: int = SAMPLE_RATE) -> None:
+        """Start a voice for pre-rendered samples."""
+        if sample_rate != self.mixer.sample_rate:
+            raise RuntimeError(f"Sample rate {sample_rate} does not match {self.mixer.sample_rate}")
+        self.mixer.play_buffer(samples)
+
+    def note_on(self, frequency: int) -> int:
+        """Start a held voice and return its id."""
+        return self.mixer.note_on(frequency)
+
+    def note_off(self, handle: int) -> None:
+        """Release a held voice."""
+        self.mixer.note_off(handle)
+
+    def _run(self):
+        """Render a block whenever the ring buffer has room for one."""
+        block = self.mixer.block_size
+        # Prime the buffer before the sink starts pulling
+        while self.stream.ring.free() >= block:
+            self.stream.write(self.mixer.render_block())
+        self.stream.start()
+        while self._running:
+            if self.stream.wait_for_space(block, timeout=0.1):
+                self.stream.write(self.mixer.render_block())
+
+    def stats(self) -> dict:
+        """Active voices plus the output stream counters."""
+        stats = self.stream.stats()
+        stats["voices"] = self.mixer.active_voices()
+        return stats
+
+    def close(self) -> None:
+        """Stop rendering and close the output stream."""
+        self._running = False
+        self._thread.join(1.0)
+        self.stream.close()
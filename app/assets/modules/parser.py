@@ -0,0 +1,329 @@
+import re
+
+from app.assets.modules.sequence import REST_FREQUENCY, MIN_FREQUENCY, MAX_FREQUENCY
+
+MAX_COLUMN_VALUE = 0xFFFFFFFF  # Indices and durations are stored as unsigned 32-bit
+
+# Most errors listed in a NotesSyntaxError message
+MAX_REPORTED_ERRORS = 10
+CANCEL_CHECK_MASK = 0xFFF  # Cancellation is polled once every 4096 entries
+
+_NUM = r'[-+]?\d+(?:\.\d*)?'
+_QNUM = r'"\s*[-+]?\d+\s*"|\'\s*[-+]?\d+\s*\''
+_VALUE = rf'(?:{_NUM}|{_QNUM})'
+
+# Fast path: one well-formed "key: (freq, duration)," entry per match
+ENTRY_PATTERN = re.compile(
+    rf'\s*(?P<key>{_VALUE})\s*:\s*(?P<open>[(\[])\s*'
+    rf'(?P<freq>{_VALUE})\s*,\s*(?P<duration>{_VALUE})\s*,?\s*'
+    rf'(?P<close>[)\]])\s*(?P<sep>[,}}])'
+)
+# One entry alone on a line, as the formatter rewrites it
+ENTRY_LINE_PATTERN = re.compile(
+    rf'\s*(?P<key>{_VALUE})\s*:\s*(?P<open>[(\[])\s*'
+    rf'(?P<freq>{_VALUE})\s*,\s*(?P<duration>{_VALUE})\s*,?\s*'
+    rf'(?P<close>[)\]])\s*(?P<sep>,?)\s*'
+)
+CLOSE_PATTERN = re.compile(r'\s*}')
+SPACE_PATTERN = re.compile(r'\s*')
+
+# Slow path tokenizer, used only to diagnose a malformed entry
+TOKEN_PATTERN = re.compile(
+    rf'(?P<value>{_VALUE})'
+    r'|(?P<punct>[{}()\[\]:,])'
+    r'|(?P<space>\s+)'
+    r'|(?P<other>"[^"\n]*"?|\'[^\'\n]*\'?|\w+|.)'
+)
+BRACKETS = {'(': ')', '[': ']'}
+
+# Token sequence of one entry, up to the closing bracket
+ENTRY_GRAMMAR = (
+    ('value', "note index"), (':', "':'"), ('open', "'(' or '['"),
+    ('value', "frequency"), (',', "','"), ('value', "duration"),
+)
+
+
+class ParseError:
+    """A single problem found in a score, with its 1-based position."""
+
+    __slots__ = ("line", "column", "message")
+
+    def __init__(self, line: int, column: int, message: str):
+        self.line = line
+        self.column = column
+        self.message = message
+
+    def __str__(self):
+        return f"line {self.line}, column {self.column}: {self.message}"
+
+    def __repr__(self):
+        return f"ParseError({self.line}, {self.column}, {self.message!r})"
+
+
+class ParseCancelled(Exception):
+    """Raised when a background parse is cancelled before it finishes."""
+
+
+class NotesSyntaxError(ValueError):
+    """Raised when a score contains one or more errors."""
+
+    def __init__(self, errors: list):
+        self.errors = errors
+        shown = "\n".join(str(error) for error in errors[:MAX_REPORTED_ERRORS])
+        hidden = len(errors) - MAX_REPORTED_ERRORS
+        if hidden > 0:
+            shown += f"\n... and {hidden} more"
+        super().__init__(shown)
+
+
+def _to_int(literal: str) -> int:
+    """Convert a numeric literal the way int(eval(literal)) would."""
+    literal = literal.strip("\"' ")
+    if '.' in literal:
+        return int(float(literal))
+    return int(literal)
+
+
+def is_valid_frequency(freq: int) -> bool:
+    """Check a frequency against the playable range, allowing rests."""
+    return freq == REST_FREQUENCY or MIN_FREQUENCY <= freq <= MAX_FREQUENCY
+
+
+def frequency_error(freq: int) -> str:
+    return (f"Frequency {freq}Hz out of range ({MIN_FREQUENCY}-{MAX_FREQUENCY}, "
+            f"or {REST_FREQUENCY} for a rest)")
+
+
+def is_valid_column_value(value: int) -> bool:
+    """Check that a note index or duration fits its unsigned column."""
+    return 0 <= value <= MAX_COLUMN_VALUE
+
+
+def column_error(name: str, value: int) -> str:
+    return f"{name} {value} out of range (0-{MAX_COLUMN_VALUE})"
+
+
+def _describe(kind: str, text: str) -> str:
+    return "end of input" if kind is None else repr(text)
+
+
+class NotesParser:
+    """Single-pass parser for the {index: (frequency, duration)} format.
+
+    Well-formed entries are consumed by one compiled regex each. When an
+    entry does not match, it is re-read token by token to report exactly
+    what was expected, then parsing resumes after the next top-level
+    comma so that every error in the score is collected.
+    """
+
+    def __init__(self, text: str, cancel=None):
+        self.text = text
+        self.cancel = cancel  # Event checked between entries, if given
+        self.notes = {}
+        self.errors = []
+        # Incremental position-to-line tracking, positions only move forward
+        self._line = 1
+        self._line_start = 0
+        self._line_pos = 0
+
+    def position(self, pos: int) -> tuple:
+        """Return the 1-based (line, column) of a text offset."""
+        if pos < self._line_pos:
+            self._line, self._line_start, self._line_pos = 1, 0, 0
+        newlines = self.text.count('\n', self._line_pos, pos)
+        if newlines:
+            self._line += newlines
+            self._line_start = self.text.rfind('\n', self._line_pos, pos) + 1
+        self._line_pos = pos
+        return self._line, pos - self._line_start + 1
+
+    def error(self, pos: int, message: str) -> None:
+        line, column = self.position(pos)
+        self.errors.append(ParseError(line, column, message))
+
+    def parse(self) -> dict:
+        """Parse the whole text, collecting notes and errors."""
+        text = self.text
+        pos = SPACE_PATTERN.match(text).end()
+        if not text.startswith('{', pos):
+            self.error(pos, "Notes must be in dictionary format")
+            return self.notes
+        pos += 1
+
+        closed = False
+        match_entry = ENTRY_PATTERN.match
+        cancel = self.cancel
+        entries = 0
+        while True:
+            entries += 1
+            if cancel is not None and not entries & CANCEL_CHECK_MASK and cancel.is_set():
+                raise ParseCancelled()
+            close = CLOSE_PATTERN.match(text, pos)
+            if close:
+                pos = close.end()
+                closed = True
+                break
+
+            match = match_entry(text, pos)
+            if match and BRACKETS[match.group('open')] == match.group('close'):
+                self.add_note(match)
+                pos = match.end()
+                if match.group('sep') == '}':
+                    closed = True
+                    break
+                continue
+
+            pos = self.diagnose(pos)
+            if pos is None:
+                break
+            if text.startswith('}', pos):
+                pos += 1
+                closed = True
+                break
+
+        if not closed:
+            self.error(len(text), "Missing closing '}'")
+        else:
+            end = SPACE_PATTERN.match(text, pos).end()
+            if end < len(text):
+                self.error(end, "Unexpected text after closing '}'")
+        return self.notes
+
+    def add_note(self, match) -> None:
+        """Validate and store a note from a fast-path match."""
+        key = _to_int(match.group('key'))
+        if not is_valid_column_value(key):
+            self.error(match.start('key'), column_error("Note index", key))
+            return
+        try:
+            freq = _to_int(match.group('freq'))
+            duration = _to_int(match.group('duration'))
+        except ValueError:
+            self.error(match.start('freq'), f"Invalid values for note {key}")
+            return
+        if not is_valid_frequency(freq):
+            self.error(match.start('freq'), frequency_error(freq))
+            return
+        if not is_valid_column_value(duration):
+            self.error(match.start('duration'), column_error("Duration", duration))
+            return
+        self.notes[key] = (freq, duration)
+
+    def tokens(self, pos: int):
+        """Yield (kind, text, start) tokens from pos, skipping whitespace."""
+        for match in TOKEN_PATTERN.finditer(self.text, pos):
+            kind = match.lastgroup
+            if kind != 'space':
+                yield kind, match.group(), match.start()
+        yield None, "", len(self.text)
+
+    def diagnose(self, pos: int):
+        """Report the first error of a malformed entry and skip past it.
+
+        Returns the offset to resume parsing from (the next entry or the
+        closing brace), or None at end of input.
+        """
+        tokens = self.tokens(pos)
+        kind, text, start = next(tokens)
+        if kind is None:
+            return None
+
+        depth = 0
+        opener = None
+        expected = None
+        for want, label in ENTRY_GRAMMAR:
+            if want == 'value':
+                ok = kind == 'value'
+            elif want == 'open':
+                ok = text in BRACKETS
+            else:
+                ok = text == want
+            if not ok:
+                expected = label
+                break
+            if want == 'open':
+                opener = text
+                depth = 1
+            kind, text, start = next(tokens)
+        else:
+            if text == ',':
+                kind, text, start = next(tokens)
+            closer = BRACKETS[opener]
+            if text != closer:
+                expected = f"'{closer}'"
+            else:
+                depth = 0
+                kind, text, start = next(tokens)
+                if text == ',':
+                    return start + 1
+                if text == '}':
+                    return start
+                if kind is None:
+                    return None
+                # Missing separator: resume at the token as a new entry
+                self.error(start, f"Expected ',' or '}}', found {_describe(kind, text)}")
+                return start
+
+        self.error(start, f"Expected {expected}, found {_describe(kind, text)}")
+
+        # Recover: skip to the next comma or closing brace at entry level
+        while kind is not None:
+            if text in BRACKETS or text == '{':
+                depth += 1
+            elif text in (')', ']') or (text == '}' and depth):
+                depth = max(depth - 1, 0)
+            elif text == '}':
+                return start
+            elif text == ',' and depth == 0:
+                return start + 1
+            kind, text, start = next(tokens)
+        return None
+
+
+def dump_notes(notes) -> str:
+    """Serialize a score to aligned {index: (frequency, duration)} text."""
+    if not notes:
+        return "{\n}"
+    key_width = max(len(str(k)) for k in notes.keys())
+    entries = [
+        f"    {str(k).rjust(key_width)}: ({freq:>5}, {duration:>4})"
+        for k, (freq, duration) in notes.items()
+    ]
+    return "{\n" + ",\n".join(entries) + "\n}"
+
+
+def format_line(line: str, key_width: int):
+    """Rewrite one line the way dump_notes would, or None if it can't be.
+
+    Only lines holding a single complete entry or a lone brace are
+    rewritten; the entry keeps its own trailing comma, if any.
+    """
+    stripped = line.strip()
+    if stripped in ("{", "}"):
+        return stripped
+    match = ENTRY_LINE_PATTERN.fullmatch(line)
+    if not match or BRACKETS[match.group('open')] != match.group('close'):
+        return None
+    try:
+        key, freq, duration = (_to_int(match.group(name)) for name in ('key', 'freq', 'duration'))
+    except ValueError:
+        return None
+    return f"    {str(key).rjust(key_width)}: ({freq:>5}, {duration:>4}){match.group('sep')}"
+
+
+def scan_notes(text: str, cancel=None) -> tuple:
+    """Parse a score, returning (notes, errors) without raising.
+
+    A set cancel event stops the parse with ParseCancelled.
+    """
+    parser = NotesParser(text, cancel)
+    notes = parser.parse()
+    return notes, parser.errors
+
+
+def parse_notes(text: str) -> dict:
+    """Parse and validate a score, raising NotesSyntaxError on any error."""
+    notes, errors = scan_notes(text)
+    if errors:
+        raise NotesSyntaxError(errors)
+    return notes
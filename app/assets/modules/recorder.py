@@ -0,0 +1,109 @@
+import time
+from array import array
+
+from app.assets.modules.sequence import REST_FREQUENCY, NoteSequence, playable_frequency
+
+# Recorder configuration defaults
+DEFAULT_CAPACITY = 1 << 16  # Events preallocated; the buffer doubles when full
+DEFAULT_QUANTIZE_MS = 50  # Grid that onsets and releases snap to
+
+# Event kinds
+NOTE_ON = 1
+NOTE_OFF = 0
+
+
+class PerformanceRecorder:
+    """Logs live note-on/off events into preallocated array columns.
+
+    Recording an event is one monotonic clock read and three array
+    stores, so it adds nothing measurable to the key handler. Events are
+    only paired, quantized and reduced to a score when exported.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.times = array('d', bytes(8 * capacity))
+        self.keys = array('H', bytes(2 * capacity))
+        self.kinds = array('B', bytes(capacity))
+        self.count = 0
+        self.recording = False
+        self._start = 0.0
+
+    def start(self) -> None:
+        """Clear the buffer and start recording."""
+        self.count = 0
+        self._start = time.monotonic()
+        self.recording = True
+
+    def stop(self) -> None:
+        """Stop recording, keeping the events for export."""
+        self.recording = False
+
+    def record(self, kind: int, key: int) -> None:
+        """Log a note event for a key number if recording."""
+        if not self.recording:
+            return
+        if self.count == len(self.times):
+            self._grow()
+        i = self.count
+        self.times[i] = time.monotonic() - self._start
+        self.keys[i] = key
+        self.kinds[i] = kind
+        self.count = i + 1
+
+    def _grow(self) -> None:
+        """Double the capacity of every column."""
+        size = len(self.times)
+        self.times.extend(array('d', bytes(8 * size)))
+        self.keys.extend(array('H', bytes(2 * size)))
+        self.kinds.extend(array('B', bytes(size)))
+
+    def notes(self) -> list:
+        """Pair events into (start ms, end ms, key) tuples sorted by start."""
+        held = {}
+        notes = []
+        for i in range(self.count):
+            key = self.keys[i]
+            ms = self.times[i] * 1000.0
+            if self.kinds[i] == NOTE_ON:
+                if key not in held:
+                    held[key] = ms
+            elif key in held:
+                notes.append((held.pop(key), ms, key))
+        end = self.times[self.count - 1] * 1000.0 if self.count else 0.0
+        notes.extend((start, end, key) for key, start in held.items())
+        notes.sort()
+        return notes
+
+    def to_sequence(self, frequency, quantize_ms: int = DEFAULT_QUANTIZE_MS) -> NoteSequence:
+        """Quantize the recording into a score of back-to-back notes.
+
+        frequency maps a key number to Hz. Onsets and releases snap to the
+        grid, silence before the first note is dropped, gaps become rests,
+        and overlapping notes keep the highest one. As when importing MIDI,
+        keys below 37 Hz are moved up by octaves.
+        """
+        grid = max(quantize_ms, 1)
+        snapped = []
+        for start, end, key in self.notes():
+            start = round(start / grid) * grid
+            end = max(round(end / grid) * grid, start + grid)
+            snapped.append((start, -key, end))
+        snapped.sort()
+        # Keep the highest note of every onset
+        top = [note for i, note in enumerate(snapped) if not i or note[0] != snapped[i - 1][0]]
+
+        frequencies = array('I')
+        durations = array('I')
+        position = top[0][0] if top else 0
+        for i, (start, key, end) in enumerate(top):
+            if i + 1 < len(top):
+                end = min(end, top[i + 1][0])
+            if start > position:
+                frequencies.append(REST_FREQUENCY)
+                durations.append(start - position)
+                position = start
+            if end > position:
+                frequencies.append(playable_frequency(frequency(-key)))
+                durations.append(end - position)
+                position = end
+        return NoteSequence.from_columns(range(1, len(frequencies) + 1), frequencies, durations)
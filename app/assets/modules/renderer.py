@@ -0,0 +1,80 @@
+import numpy as np
+
+from app.assets.modules.audio import (
+    SAMPLE_RATE, MAX_AMPLITUDE, DEFAULT_VOLUME, FADE_MS, write_wav
+)
+from app.assets.modules.binscore import BinaryScore
+from app.assets.modules.sequence import NoteSequence
+
+# Number of samples synthesized per vectorized batch (~4 MB of float64)
+BATCH_SAMPLES = 1 << 19
+
+
+def note_columns(notes_dict: dict) -> tuple:
+    """Split a notes dict into frequency and duration arrays in play order."""
+    if isinstance(notes_dict, (BinaryScore, NoteSequence)):
+        # Columns are already sorted; wrap their buffers without copying
+        return np.asarray(notes_dict.frequencies), np.asarray(notes_dict.durations)
+    keys = sorted(notes_dict.keys())
+    freqs = np.fromiter((notes_dict[k][0] for k in keys), dtype=np.float64, count=len(keys))
+    durations = np.fromiter((notes_dict[k][1] for k in keys), dtype=np.int64, count=len(keys))
+    return freqs, durations
+
+
+def render_columns(freqs: np.ndarray, durations: np.ndarray,
+                   sample_rate: int = SAMPLE_RATE,
+                   volume: float = DEFAULT_VOLUME,
+                   batch_samples: int = BATCH_SAMPLES) -> np.ndarray:
+    """Render back-to-back sine notes into one 16-bit PCM buffer.
+
+    Notes are synthesized in batches of whole notes: each batch computes
+    the phase and envelope of all its samples in a single array pass.
+    """
+    counts = np.asarray(durations, dtype=np.int64) * sample_rate // 1000
+    counts = np.maximum(counts, 0)
+    starts = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=starts[1:])
+    out = np.empty(int(starts[-1]), dtype=np.int16)
+
+    fade_len = max(int(sample_rate * FADE_MS / 1000), 1)
+    steps = 2 * np.pi * np.asarray(freqs, dtype=np.float64) / sample_rate
+    amplitude = MAX_AMPLITUDE * volume
+
+    first = 0
+    while first < len(counts):
+        # Grow the batch until it reaches the sample budget (at least one note)
+        last = int(np.searchsorted(starts, starts[first] + batch_samples, side='right')) - 1
+        last = min(max(last, first + 1), len(counts))
+        base = starts[first]
+        size = int(starts[last] - base)
+        if size:
+            batch_counts = counts[first:last]
+            note_ids = np.repeat(np.arange(first, last), batch_counts)
+            local = np.arange(size, dtype=np.int64) - (starts[note_ids] - base)
+
+            # Linear fade in/out, capped at half of each note
+            fades = np.minimum(fade_len, np.maximum(counts[note_ids] // 2, 1))
+            envelope = np.minimum(local, counts[note_ids] - 1 - local) / fades
+            np.clip(envelope, 0.0, 1.0, out=envelope)
+
+            wave = np.sin(steps[note_ids] * local)
+            wave *= envelope
+            wave *= amplitude
+            out[base:base + size] = wave
+        first = last
+    return out
+
+
+def render_notes(notes_dict: dict, sample_rate: int = SAMPLE_RATE,
+                 volume: float = DEFAULT_VOLUME) -> np.ndarray:
+    """Render a {index: (freq, duration)} score into a PCM buffer."""
+    freqs, durations = note_columns(notes_dict)
+    return render_columns(freqs, durations, sample_rate, volume)
+
+
+def render_to_wav(notes_dict: dict, path: str, sample_rate: int = SAMPLE_RATE,
+                  volume: float = DEFAULT_VOLUME) -> float:
+    """Render a score to a WAV file and return its length in seconds."""
+    samples = render_notes(notes_dict, sample_rate, volume)
+    write_wav(path, samples, sample_rate)
+    return len(samples) / sample_rate
@@ -0,0 +1,139 @@
+import queue
+import threading
+import time
+from array import array
+
+from app.assets.modules.audio import get_backend
+from app.assets.modules.parser import REST_FREQUENCY
+from app.assets.modules.sequence import NoteSequence
+
+# Scheduler configuration defaults
+DEFAULT_LOOKAHEAD = 0.1  # seconds of notes queued ahead of the clock
+SPIN_THRESHOLD = 0.002  # final stretch before an onset is busy-waited
+MIN_NOTE_MS = 10  # shortest remainder worth playing of a late note
+LATE_TOLERANCE = 0.001  # onset error in seconds still treated as on time
+
+
+class PlaybackScheduler:
+    """Plays a score on a fixed monotonic-clock timeline.
+
+    Every note gets an absolute onset computed up front from the score,
+    tempo and gap, so per-note overhead never accumulates into drift. A
+    feeder thread queues notes up to a lookahead window ahead of the
+    clock, and an output thread starts each one at its onset. Late notes
+    are shortened to end on time, or skipped if under MIN_NOTE_MS of them
+    is left; notes that are short by design play in full.
+    """
+
+    def __init__(self, backend=None, lookahead: float = DEFAULT_LOOKAHEAD,
+                 on_error=None):
+        self.backend = backend or get_backend()
+        self.lookahead = lookahead
+        self.on_error = on_error
+
+        # Measured onset error of every started note, in milliseconds
+        self.jitter = array('d')
+        self.skipped = 0
+
+        self._stop = threading.Event()
+        self._threads = []
+
+    @staticmethod
+    def timeline(sequence: NoteSequence, tempo: float = 1.0, gap: int = 0) -> array:
+        """Return note onsets in seconds relative to the start of playback."""
+        if tempo <= 0:
+            raise ValueError("Tempo must be positive")
+        scale = 1.0 / (1000.0 * tempo)
+        onsets = array('d', bytes(8 * len(sequence)))
+        position = 0
+        for i, duration in enumerate(sequence.durations):
+            onsets[i] = position * scale
+            position += duration + gap
+        return onsets
+
+    def play(self, notes, tempo: float = 1.0, gap: int = 0) -> None:
+        """Start playing a score in the background."""
+        self.stop()
+        self._stop = threading.Event()
+        self.jitter = array('d')
+        self.skipped = 0
+
+        sequence = NoteSequence.from_dict(notes)
+        onsets = self.timeline(sequence, tempo, gap)
+        start = time.monotonic() + self.lookahead
+        notes_queue = queue.Queue()
+
+        self._threads = [
+            threading.Thread(target=self._feed, name="scheduler-feed", daemon=True,
+                             args=(notes_queue, self._stop, sequence, onsets, tempo, start)),
+            threading.Thread(target=self._output, name="scheduler-output", daemon=True,
+                             args=(notes_queue, self._stop)),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _feed(self, notes_queue: queue.Queue, stop: threading.Event,
+              sequence: NoteSequence, onsets: array, tempo: float, start: float):
+        """Queue notes once they fall inside the lookahead window."""
+        for onset, freq, duration in zip(onsets, sequence.frequencies, sequence.durations):
+            target = start + onset
+            wait = target - self.lookahead - time.monotonic()
+            if wait > 0 and stop.wait(wait):
+                break
+            if freq != REST_FREQUENCY:
+                notes_queue.put((target, freq, duration / tempo / 1000.0))
+        notes_queue.put(None)
+
+    def _output(self, notes_queue: queue.Queue, stop: threading.Event):
+        """Start each queued note at its onset on the monotonic clock."""
+        while not stop.is_set():
+            item = notes_queue.get()
+            if item is None:
+                return
+            target, freq, length = item
+
+            # Sleep coarsely, then spin for the last couple of milliseconds
+            remaining = target - time.monotonic()
+            if remaining > SPIN_THRESHOLD and stop.wait(remaining - SPIN_THRESHOLD):
+                return
+            while time.monotonic() < target:
+                pass
+
+            now = time.monotonic()
+            late = now - target
+            duration_ms = round(length * 1000)
+            if late > LATE_TOLERANCE:
+                duration_ms = int((length - late) * 1000)
+                if duration_ms < MIN_NOTE_MS:
+                    self.skipped += 1
+                    continue
+            self.jitter.append(late * 1000.0)
+            try:
+                self.backend.play(freq, duration_ms)
+            except Exception as e:  # Reported rather than dying silently in the thread
+                if self.on_error:
+                    self.on_error(e)
+                return
+
+    def wait(self, timeout: float = None) -> None:
+        """Block until playback finishes."""
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def stop(self) -> None:
+        """Stop playback; the note currently sounding is allowed to end."""
+        self._stop.set()
+
+    def jitter_stats(self) -> dict:
+        """Summarize onset error in milliseconds."""
+        values = sorted(self.jitter)
+        if not values:
+            return {"notes": 0, "skipped": self.skipped}
+        return {
+            "notes": len(values),
+            "skipped": self.skipped,
+            "mean": sum(values) / len(values),
+            "p50": values[len(values) // 2],
+            "p95": values[min(int(len(values) * 0.95), len(values) - 1)],
+            "max": values[-1],
+        }
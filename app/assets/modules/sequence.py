@@ -0,0 +1,164 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from itertools import accumulate
+
+# Column type codes: unsigned 32-bit for every column
+INDEX_TYPE = 'I'
+FREQUENCY_TYPE = 'I'
+DURATION_TYPE = 'I'
+
+REST_FREQUENCY = 0  # Silent note of the given duration
+
+# Accepted frequency range, matching winsound.Beep
+MIN_FREQUENCY = 37
+MAX_FREQUENCY = 32767
+
+
+def playable_frequency(frequency: float) -> int:
+    """Move a pitch by octaves into the playable range and round it to Hz.
+
+    Used for notes from sources with a wider range than the beeper, such
+    as MIDI files and the lowest piano keys, so they keep their pitch class.
+    """
+    if frequency <= 0:
+        raise ValueError(f"Frequency {frequency} must be positive")
+    while round(frequency) < MIN_FREQUENCY:
+        frequency *= 2
+    while round(frequency) > MAX_FREQUENCY:
+        frequency /= 2
+    return round(frequency)
+
+
+def _copy_column(typecode: str, values) -> array:
+    """Build an array column, copying buffers without a Python loop."""
+    if isinstance(values, memoryview):
+        column = array(typecode)
+        if values.format == typecode:
+            column.frombytes(values.cast('B'))
+            return column
+        return array(typecode, values)
+    return array(typecode, values)
+
+
+class NoteSequence(Mapping):
+    """Score stored as parallel array columns sorted by note index.
+
+    Each note costs 12 bytes (index, frequency, duration) instead of a
+    dict entry plus a tuple, indices stay sorted so playback never sorts,
+    and lookups by index or by time are binary searches. It behaves as a
+    read-only {index: (freq, duration)} mapping, so code written for
+    plain dicts keeps working.
+    """
+
+    __slots__ = ("indices", "frequencies", "durations", "_onsets")
+
+    def __init__(self, indices=(), frequencies=(), durations=(), presorted: bool = False):
+        self.indices = _copy_column(INDEX_TYPE, indices)
+        self.frequencies = _copy_column(FREQUENCY_TYPE, frequencies)
+        self.durations = _copy_column(DURATION_TYPE, durations)
+        self._onsets = None
+        if not len(self.indices) == len(self.frequencies) == len(self.durations):
+            raise ValueError("Note columns must have the same length")
+        if not presorted and any(a >= b for a, b in zip(self.indices, self.indices[1:])):
+            self._sort()
+
+    @classmethod
+    def from_dict(cls, notes: Mapping) -> "NoteSequence":
+        """Build a sequence from a {index: (freq, duration)} mapping."""
+        if isinstance(notes, cls):
+            return notes
+        keys = sorted(notes.keys())
+        values = [notes[k] for k in keys]
+        return cls(keys, (v[0] for v in values), (v[1] for v in values))
+
+    @classmethod
+    def from_columns(cls, indices, frequencies, durations,
+                     presorted: bool = False) -> "NoteSequence":
+        """Build a sequence from column buffers such as BinaryScore's.
+
+        presorted skips the ordering check for indices known to be
+        strictly increasing, e.g. a subset of another sequence's.
+        """
+        return cls(indices, frequencies, durations, presorted)
+
+    def _sort(self) -> None:
+        """Sort the columns by index, keeping the last duplicate."""
+        latest = {}
+        for pos, key in enumerate(self.indices):
+            latest[key] = pos
+        order = [latest[key] for key in sorted(latest)]
+        self.indices = array(INDEX_TYPE, (self.indices[i] for i in order))
+        self.frequencies = array(FREQUENCY_TYPE, (self.frequencies[i] for i in order))
+        self.durations = array(DURATION_TYPE, (self.durations[i] for i in order))
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self):
+        return iter(self.indices)
+
+    def __contains__(self, key):
+        pos = bisect_left(self.indices, key)
+        return pos < len(self.indices) and self.indices[pos] == key
+
+    def __getitem__(self, key):
+        pos = bisect_left(self.indices, key)
+        if pos == len(self.indices) or self.indices[pos] != key:
+            raise KeyError(key)
+        return self.frequencies[pos], self.durations[pos]
+
+    def __repr__(self):
+        return f"NoteSequence({len(self)} notes)"
+
+    def items(self):
+        """Iterate (index, (freq, duration)) pairs in play order."""
+        return zip(self.indices, zip(self.frequencies, self.durations))
+
+    def set(self, index: int, frequency: int, duration: int) -> None:
+        """Insert or replace a note, keeping indices sorted."""
+        pos = bisect_left(self.indices, index)
+        if pos < len(self.indices) and self.indices[pos] == index:
+            self.frequencies[pos] = frequency
+            self.durations[pos] = duration
+        else:
+            self.indices.insert(pos, index)
+            self.frequencies.insert(pos, frequency)
+            self.durations.insert(pos, duration)
+        self._onsets = None
+
+    def remove(self, index: int) -> None:
+        """Delete the note with the given index."""
+        pos = bisect_left(self.indices, index)
+        if pos == len(self.indices) or self.indices[pos] != index:
+            raise KeyError(index)
+        del self.indices[pos]
+        del self.frequencies[pos]
+        del self.durations[pos]
+        self._onsets = None
+
+    def onsets(self) -> array:
+        """Start time of every note in milliseconds, played back to back."""
+        if self._onsets is None:
+            self._onsets = array('Q', accumulate(self.durations, initial=0))
+        return self._onsets
+
+    def total_duration(self) -> int:
+        """Length of the whole score in milliseconds."""
+        return self.onsets()[-1]
+
+    def position_at(self, time_ms: int) -> int:
+        """Return the column position of the note sounding at a time."""
+        onsets = self.onsets()
+        if not 0 <= time_ms < onsets[-1]:
+            raise IndexError(f"Time {time_ms} ms is outside the score")
+        return bisect_right(onsets, time_ms) - 1
+
+    def note_at(self, time_ms: int) -> tuple:
+        """Return (index, freq, duration) of the note sounding at a time."""
+        pos = self.position_at(time_ms)
+        return self.indices[pos], self.frequencies[pos], self.durations[pos]
+
+    def to_dict(self) -> dict:
+        """Copy the sequence into a plain notes dict."""
+        return dict(self.items())
@@ -0,0 +1,273 @@
+import threading
+import time
+import wave
+
+try:
+    import sounddevice
+except ImportError:  # Optional: real-time output on a sound card
+    sounddevice = None
+
+from app.assets.modules.audio import SAMPLE_RATE, SAMPLE_WIDTH
+
+# Stream configuration defaults, in frames (one 16-bit mono sample each)
+DEFAULT_BUFFER_FRAMES = 2048  # ~46 ms at 44.1 kHz
+DEFAULT_BLOCK_FRAMES = 256
+
+
+class RingBuffer:
+    """Fixed-size byte ring shared by one writer and one reader.
+
+    A single lock guards the read and write positions; copies happen
+    outside of any allocation, so the reader can run inside a device
+    callback. Writes that do not fit are truncated and counted as
+    overruns, reads that find too little data are zero-padded and
+    counted as underruns.
+    """
+
+    def __init__(self, frames: int = DEFAULT_BUFFER_FRAMES):
+        if frames < 1:
+            raise ValueError("Ring buffer needs at least one frame")
+        self.capacity = frames * SAMPLE_WIDTH
+        self._data = bytearray(self.capacity)
+        self._read = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+
+        # Accounting counters
+        self.underruns = 0
+        self.underrun_frames = 0
+        self.overruns = 0
+        self.overrun_frames = 0
+
+    def buffered(self) -> int:
+        """Frames waiting to be read."""
+        return self._size // SAMPLE_WIDTH
+
+    def free(self) -> int:
+        """Frames that can be written without an overrun."""
+        return (self.capacity - self._size) // SAMPLE_WIDTH
+
+    def write(self, data) -> int:
+        """Copy 16-bit samples into the ring and return the frames written."""
+        view = memoryview(data).cast('B')
+        with self._lock:
+            count = min(len(view), self.capacity - self._size)
+            if count < len(view):
+                self.overruns += 1
+                self.overrun_frames += (len(view) - count) // SAMPLE_WIDTH
+            start = (self._read + self._size) % self.capacity
+            first = min(count, self.capacity - start)
+            self._data[start:start + first] = view[:first]
+            self._data[:count - first] = view[first:count]
+            self._size += count
+        return count // SAMPLE_WIDTH
+
+    def read_into(self, out) -> int:
+        """Fill a writable buffer with samples, zero-padding on underrun."""
+        view = memoryview(out).cast('B')
+        with self._space:
+            count = min(len(view), self._size)
+            if count < len(view):
+                self.underruns += 1
+                self.underrun_frames += (len(view) - count) // SAMPLE_WIDTH
+            first = min(count, self.capacity - self._read)
+            view[:first] = self._data[self._read:self._read + first]
+            view[first:count] = self._data[:count - first]
+            self._read = (self._read + count) % self.capacity
+            self._size -= count
+            self._space.notify()
+        view[count:] = bytes(len(view) - count)
+        return count // SAMPLE_WIDTH
+
+    def read(self, frames: int) -> bytes:
+        """Return the next frames as bytes, zero-padded on underrun."""
+        out = bytearray(frames * SAMPLE_WIDTH)
+        self.read_into(out)
+        return bytes(out)
+
+    def wait_for_space(self, frames: int, timeout: float = None) -> bool:
+        """Block until the given number of frames can be written."""
+        with self._space:
+            return self._space.wait_for(lambda: self.free() >= frames, timeout)
+
+    def stats(self) -> dict:
+        """Return a snapshot of the accounting counters."""
+        with self._lock:
+            return {
+                "buffered": self._size // SAMPLE_WIDTH,
+                "underruns": self.underruns,
+                "underrun_frames": self.underrun_frames,
+                "overruns": self.overruns,
+                "overrun_frames": self.overrun_frames,
+            }
+
+
+class OutputSink:
+    """Base class for stream sinks that pull blocks through a callback."""
+
+    name = "base"
+
+    def start(self, callback, sample_rate: int, block_frames: int) -> None:
+        """Begin calling callback(out) with a block-sized writable buffer."""
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        """Stop pulling blocks and release the device or file."""
+
+
+class ClockedSink(OutputSink):
+    """Sink that pulls one block per block period on the monotonic clock.
+
+    It stands in for a sound card's callback thread, so the stream can
+    be exercised without audio hardware.
+    """
+
+    def __init__(self):
+        self.frames_written = 0
+        self._running = False
+        self._thread = None
+
+    def start(self, callback, sample_rate: int, block_frames: int) -> None:
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.name}-sink", daemon=True,
+            args=(callback, sample_rate, block_frames)
+        )
+        self._thread.start()
+
+    def _run(self, callback, sample_rate: int, block_frames: int):
+        period = block_frames / sample_rate
+        out = bytearray(block_frames * SAMPLE_WIDTH)
+        deadline = time.monotonic()
+        while self._running:
+            callback(out)
+            self.consume(out)
+            self.frames_written += block_frames
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def consume(self, block: bytearray) -> None:
+        """Handle one block of output."""
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread:
+            self._thread.join(1.0)
+
+
+class NullSink(ClockedSink):
+    """Discards output at real-time pace."""
+
+    name = "null"
+
+
+class WavSink(ClockedSink):
+    """Writes output to a WAV file at real-time pace."""
+
+    name = "wav"
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._wav = None
+
+    def start(self, callback, sample_rate: int, block_frames: int) -> None:
+        self._wav = wave.open(self.path, 'wb')
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(SAMPLE_WIDTH)
+        self._wav.setframerate(sample_rate)
+        super().start(callback, sample_rate, block_frames)
+
+    def consume(self, block: bytearray) -> None:
+        self._wav.writeframes(block)
+
+    def stop(self) -> None:
+        super().stop()
+        if self._wav:
+            self._wav.close()
+            self._wav = None
+
+
+class DeviceSink(OutputSink):
+    """Sound card output driven by the device's own callback thread."""
+
+    name = "device"
+
+    def __init__(self, device=None):
+        if sounddevice is None:
+            raise RuntimeError("Device output requires the sounddevice package")
+        self.device = device
+        self._stream = None
+
+    def start(self, callback, sample_rate: int, block_frames: int) -> None:
+        def device_callback(outdata, frames, time_info, status):
+            callback(outdata)
+
+        self._stream = sounddevice.RawOutputStream(
+            samplerate=sample_rate, blocksize=block_frames, channels=1,
+            dtype='int16', device=self.device, callback=device_callback
+        )
+        self._stream.start()
+
+    def stop(self) -> None:
+        if self._stream:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+
+def default_sink(path: str = None) -> OutputSink:
+    """Pick a WAV file sink, the sound card if available, or a null sink."""
+    if path:
+        return WavSink(path)
+    if sounddevice is not None:
+        return DeviceSink()
+    return NullSink()
+
+
+class OutputStream:
+    """One long-lived output stream fed through a ring buffer.
+
+    The synth side calls write() with blocks of 16-bit samples; the sink
+    pulls blocks from its own thread. The buffer size sets the latency
+    budget: larger buffers ride out scheduling hiccups, smaller ones
+    respond faster.
+    """
+
+    def __init__(self, sink: OutputSink = None, sample_rate: int = SAMPLE_RATE,
+                 buffer_frames: int = DEFAULT_BUFFER_FRAMES,
+                 block_frames: int = DEFAULT_BLOCK_FRAMES):
+        if block_frames > buffer_frames:
+            raise ValueError("Block size cannot exceed the buffer size")
+        self.sink = sink or default_sink()
+        self.sample_rate = sample_rate
+        self.block_frames = block_frames
+        self.ring = RingBuffer(buffer_frames)
+        self._started = False
+
+    def start(self) -> None:
+        """Start the sink pulling from the ring buffer."""
+        if not self._started:
+            self._started = True
+            self.sink.start(self.ring.read_into, self.sample_rate, self.block_frames)
+
+    def write(self, samples) -> int:
+        """Queue samples for output; excess frames are counted as overrun."""
+        return self.ring.write(samples)
+
+    def wait_for_space(self, frames: int, timeout: float = None) -> bool:
+        """Block until the given number of frames can be written."""
+        return self.ring.wait_for_space(frames, timeout)
+
+    def stats(self) -> dict:
+        """Buffer level plus underrun and overrun counters."""
+        return self.ring.stats()
+
+    def close(self) -> None:
+        """Stop the sink."""
+        if self._started:
+            self.sink.stop()
+            self._started = False
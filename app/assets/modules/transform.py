@@ -0,0 +1,136 @@
+import numpy as np
+
+from app.assets.modules.parser import (
+    MIN_FREQUENCY, MAX_FREQUENCY, MAX_COLUMN_VALUE, REST_FREQUENCY
+)
+from app.assets.modules.sequence import (
+    NoteSequence, INDEX_TYPE, FREQUENCY_TYPE, DURATION_TYPE
+)
+
+CENTS_PER_OCTAVE = 1200
+MAX_OCTAVE_FOLDS = 16  # 37 Hz to 32767 Hz spans under ten octaves
+
+
+def note_arrays(notes) -> tuple:
+    """Return (indices, frequencies, durations) of a score as NumPy arrays.
+
+    Column buffers are wrapped without copying; every transform writes
+    new arrays, so the source score is never modified.
+    """
+    sequence = NoteSequence.from_dict(notes)
+    return (np.frombuffer(sequence.indices, dtype=np.uint32),
+            np.frombuffer(sequence.frequencies, dtype=np.uint32),
+            np.frombuffer(sequence.durations, dtype=np.uint32))
+
+
+def _check_column(values: np.ndarray, name: str) -> None:
+    """Raise ValueError if a column holds values its uint32 storage can't."""
+    if len(values) and (values.min() < 0 or values.max() > MAX_COLUMN_VALUE):
+        bad = values[(values < 0) | (values > MAX_COLUMN_VALUE)][0]
+        raise ValueError(f"{name} {int(bad)} out of range (0-{MAX_COLUMN_VALUE})")
+
+
+def to_sequence(indices, frequencies, durations) -> NoteSequence:
+    """Pack transformed columns back into a NoteSequence.
+
+    Transforms keep the source indices or a subset of them, so they are
+    already strictly increasing. Values that do not fit a column raise
+    ValueError instead of wrapping around.
+    """
+    frequencies = np.asarray(frequencies)
+    playable = (frequencies == REST_FREQUENCY) | \
+        ((frequencies >= MIN_FREQUENCY) & (frequencies <= MAX_FREQUENCY))
+    if not playable.all():
+        bad = frequencies[~playable][0]
+        raise ValueError(f"Frequency {int(bad)}Hz out of range ({MIN_FREQUENCY}-{MAX_FREQUENCY}, "
+                         f"or {REST_FREQUENCY} for a rest)")
+    _check_column(np.asarray(indices), "Note index")
+    _check_column(np.asarray(durations), "Duration")
+    columns = (memoryview(np.ascontiguousarray(column, dtype=np.uint32)).cast('B').cast(code)
+               for column, code in ((indices, INDEX_TYPE), (frequencies, FREQUENCY_TYPE),
+                                    (durations, DURATION_TYPE)))
+    return NoteSequence.from_columns(*columns, presorted=True)
+
+
+def fold_into_range(frequencies: np.ndarray) -> np.ndarray:
+    """Move out-of-range pitches by octaves until they are playable.
+
+    Rests stay rests. This is how MIDI import handles notes below the
+    beeper range, and it keeps every note on its pitch class. Pitches
+    still out of range after MAX_OCTAVE_FOLDS octaves raise ValueError.
+    """
+    freqs = np.array(frequencies, dtype=np.float64)
+    sounding = freqs != REST_FREQUENCY
+    for folds in range(MAX_OCTAVE_FOLDS + 1):
+        low = sounding & (freqs < MIN_FREQUENCY - 0.5)
+        high = freqs > MAX_FREQUENCY + 0.5
+        if not low.any() and not high.any():
+            break
+        if folds == MAX_OCTAVE_FOLDS:
+            raise ValueError(f"Pitches too far outside {MIN_FREQUENCY}-{MAX_FREQUENCY} Hz to fold")
+        freqs[low] *= 2
+        freqs[high] /= 2
+    out = np.rint(freqs)
+    np.clip(out, MIN_FREQUENCY, MAX_FREQUENCY, out=out, where=sounding)
+    return out.astype(np.uint32)
+
+
+def transpose(notes, semitones: float = 0, cents: float = 0) -> NoteSequence:
+    """Shift every pitch by semitones plus cents; rests are untouched."""
+    indices, freqs, durations = note_arrays(notes)
+    try:
+        ratio = 2.0 ** ((semitones * 100 + cents) / CENTS_PER_OCTAVE)
+    except OverflowError:
+        raise ValueError(f"Transpose by {semitones:g} semitones is out of range")
+    shifted = np.where(freqs != REST_FREQUENCY, freqs * ratio, REST_FREQUENCY)
+    return to_sequence(indices, fold_into_range(shifted), durations)
+
+
+def scale_durations(notes, factor: float) -> NoteSequence:
+    """Multiply every duration by factor; 0.9 plays the score 10% faster.
+
+    Note boundaries are scaled on the absolute timeline and rounded
+    there, so rounding never accumulates into drift. Notes never shrink
+    below 1 ms, and durations past the column range raise ValueError.
+    """
+    if factor <= 0:
+        raise ValueError("Duration factor must be positive")
+    indices, freqs, durations = note_arrays(notes)
+    ends = np.rint(np.cumsum(durations, dtype=np.float64) * factor)
+    scaled = np.diff(ends, prepend=0.0)
+    np.maximum(scaled, 1, out=scaled, where=durations > 0)
+    return to_sequence(indices, freqs, scaled)
+
+
+def quantize(notes, grid_ms: int) -> NoteSequence:
+    """Snap every note boundary to a grid; notes shorter than it may vanish."""
+    if grid_ms <= 0:
+        raise ValueError("Quantize grid must be positive")
+    indices, freqs, durations = note_arrays(notes)
+    ends = np.cumsum(durations, dtype=np.int64)
+    snapped = (ends + grid_ms // 2) // grid_ms * grid_ms
+    lengths = np.diff(snapped, prepend=0)
+    keep = lengths > 0
+    return to_sequence(indices[keep], freqs[keep], lengths[keep])
+
+
+def reverse(notes) -> NoteSequence:
+    """Play the score backwards, keeping the note indices in place."""
+    indices, freqs, durations = note_arrays(notes)
+    return to_sequence(indices, freqs[::-1], durations[::-1])
+
+
+def filter_range(notes, low: int = MIN_FREQUENCY, high: int = MAX_FREQUENCY,
+                 keep_time: bool = True) -> NoteSequence:
+    """Keep notes between low and high Hz inclusive.
+
+    With keep_time the other notes become rests, so the rest of the score
+    stays in time; otherwise they are removed. Rests are always kept.
+    """
+    if low > high:
+        raise ValueError("Lowest frequency must not exceed the highest")
+    indices, freqs, durations = note_arrays(notes)
+    inside = (freqs == REST_FREQUENCY) | ((freqs >= low) & (freqs <= high))
+    if keep_time:
+        return to_sequence(indices, np.where(inside, freqs, REST_FREQUENCY), durations)
+    return to_sequence(indices[inside], freqs[inside], durations[inside])
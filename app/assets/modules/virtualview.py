@@ -0,0 +1,171 @@
+import tkinter as tk
+from contextlib import nullcontext
+
+# Lines materialised in the widget: the visible area plus a margin on
+# each side, so ordinary scrolling never waits for a page-in
+PAGE_MARGIN = 200
+WINDOW_LINES = 600
+
+
+class VirtualTextView:
+    """Shows a window of a ScoreDocument in a Text widget.
+
+    Only WINDOW_LINES lines live in the widget. The scrollbar is driven
+    in document coordinates, and when the view nears either edge of the
+    window the edited window is written back to the document and a new
+    one is paged in around the same top line. The highlighter therefore
+    only ever sees a few hundred lines. Paging is kept out of the undo
+    history, which records edits in document lines instead.
+    """
+
+    def __init__(self, text: tk.Text, scrollbar, document, on_page=None, history=None):
+        self.text = text
+        self.scrollbar = scrollbar
+        self.document = document
+        self.on_page = on_page  # Called after every page-in
+        self.history = history  # EditHistory of the widget, if any
+        self.window_start = 1
+        self.window_count = 0
+        self._repage_job = None
+        self._loading = False
+
+        self.text.configure(yscrollcommand=self._on_text_scroll)
+        self.scrollbar.configure(command=self._on_scrollbar)
+        if self.history is not None:
+            self.history.show_lines = self.show_range
+        self.load(1)
+
+    def detach(self) -> None:
+        """Commit edits and hand scrolling back to the widget."""
+        self.commit()
+        if self._repage_job is not None:
+            self.text.after_cancel(self._repage_job)
+            self._repage_job = None
+        if self.history is not None:
+            self.history.line_offset = 0
+            self.history.show_lines = None
+        self.text.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.text.yview)
+
+    def set_document(self, document, top: int = None) -> None:
+        """Show another document, keeping the top line by default."""
+        top = self.top_line() if top is None else top
+        self.document = document
+        self.window_count = 0
+        self.text.edit_modified(False)
+        self.load(top)
+
+    def _widget_lines(self) -> int:
+        return int(self.text.index("end-1c").split('.')[0])
+
+    def total_lines(self) -> int:
+        """Document length including uncommitted edits in the window."""
+        return self.document.line_count - self.window_count + self._widget_lines()
+
+    def top_line(self) -> int:
+        """Document line shown at the top of the widget."""
+        return self.window_start + int(self.text.index("@0,0").split('.')[0]) - 1
+
+    def to_widget(self, line: int) -> int:
+        """Widget line of a document line, assuming it is paged in."""
+        return line - self.window_start + 1
+
+    def commit(self) -> None:
+        """Write the window back into the document if it was edited."""
+        if self.window_count and self.text.edit_modified():
+            lines = self.text.get("1.0", "end-1c").split('\n')
+            self.document.replace(self.window_start,
+                                  self.window_start + self.window_count - 1, lines)
+            self.window_count = len(lines)
+            self.text.edit_modified(False)
+
+    def load(self, top: int, lines: int = 1) -> None:
+        """Page in the window around a document line and show it at the top.
+
+        The window also holds at least lines lines from top on.
+        """
+        cursor_line, cursor_col = map(int, self.text.index(tk.INSERT).split('.'))
+        cursor_line += self.window_start - 1
+        self.commit()
+
+        total = self.document.line_count
+        top = max(1, min(top, total))
+        start = max(1, top - PAGE_MARGIN)
+        count = max(WINDOW_LINES, top - start + lines + PAGE_MARGIN)
+        lines = self.document.lines(start, start + count - 1)
+
+        self._loading = True
+        try:
+            with self.history.paused() if self.history is not None else nullcontext():
+                self.text.delete("1.0", tk.END)
+                self.text.insert("1.0", "\n".join(lines))
+            self.text.edit_modified(False)
+            if self.history is not None:
+                self.history.line_offset = start - 1
+            self.window_start = start
+            self.window_count = len(lines)
+
+            if start <= cursor_line < start + len(lines):
+                self.text.mark_set(tk.INSERT, f"{self.to_widget(cursor_line)}.{cursor_col}")
+            self.text.yview(f"{self.to_widget(top)}.0")
+        finally:
+            self._loading = False
+        if self.on_page:
+            self.on_page()
+
+    def show_range(self, first: int, last: int) -> None:
+        """Make sure document lines first..last are paged in."""
+        if not (self.window_start <= first
+                and last < self.window_start + self._widget_lines()):
+            self.load(first, last - first + 1)
+
+    def show_line(self, line: int) -> None:
+        """Scroll a document line into view, paging it in if needed."""
+        if not self.window_start <= line < self.window_start + self._widget_lines():
+            self.load(line - PAGE_MARGIN // 4)
+        self.text.see(f"{self.to_widget(line)}.0")
+
+    def _near_edge(self) -> bool:
+        """Whether the view is within half a margin of a window edge."""
+        first, last = self.text.yview()
+        lines = self._widget_lines()
+        bottom = self.window_start - 1 + last * lines
+        near_top = first * lines < PAGE_MARGIN // 2 and self.window_start > 1
+        near_bottom = (1.0 - last) * lines < PAGE_MARGIN // 2 and bottom < self.total_lines()
+        return near_top or near_bottom
+
+    def _on_text_scroll(self, first, last):
+        """Map the widget's scroll fractions onto the whole document."""
+        first, last = float(first), float(last)
+        lines = self._widget_lines()
+        total = max(self.total_lines(), 1)
+        top = self.window_start - 1 + first * lines
+        bottom = self.window_start - 1 + last * lines
+        self.scrollbar.set(top / total, bottom / total)
+        if self._repage_job is None and not self._loading and self._near_edge():
+            self._repage_job = self.text.after_idle(self._repage)
+
+    def _repage(self):
+        self._repage_job = None
+        if self._near_edge():
+            self.load(self.top_line())
+
+    def _on_scrollbar(self, *args):
+        """Handle scrollbar drags and clicks in document coordinates."""
+        total = self.total_lines()
+        top = self.top_line()
+        visible = max(int(self.text.index(f"@0,{self.text.winfo_height()}").split('.')[0])
+                      - int(self.text.index("@0,0").split('.')[0]), 1)
+        if args[0] == "moveto":
+            target = int(float(args[1]) * total) + 1
+        elif args[0] == "scroll":
+            step = visible if args[2] == "pages" else 1
+            target = top + int(args[1]) * step
+        else:
+            return
+        target = max(1, min(target, total - visible + 1))
+
+        if self.window_start <= target and target + visible <= self.window_start + self._widget_lines():
+            self.text.yview(f"{self.to_widget(target)}.0")
+        else:
+            self.load(target)
@@ -0,0 +1,160 @@
+import threading
+from collections import deque
+
+from app.assets.modules.audio import get_backend
+
+# Pool configuration defaults
+DEFAULT_VOICES = 4
+DEFAULT_QUEUE_SIZE = 8
+
+# Voice-stealing policies applied when the queue is full
+STEAL_OLDEST = "oldest"
+STEAL_QUIETEST = "quietest"
+STEAL_SAME_NOTE = "same-note"
+STEAL_NONE = "none"
+STEAL_POLICIES = (STEAL_OLDEST, STEAL_QUIETEST, STEAL_SAME_NOTE, STEAL_NONE)
+
+
+class NoteRequest:
+    """A pending note waiting for a free voice."""
+
+    __slots__ = ("frequency", "duration", "volume", "serial", "samples", "tag")
+
+    def __init__(self, frequency: int, duration: int, volume: float, serial: int,
+                 samples=None, tag=None):
+        self.frequency = frequency
+        self.duration = duration
+        self.volume = volume
+        self.serial = serial
+        self.samples = samples  # Pre-rendered PCM, if available
+        self.tag = tag  # Caller data passed to on_start
+
+
+class VoicePool:
+    """Fixed set of long-lived voice workers fed from a bounded queue.
+
+    Each worker plays one note at a time through the audio backend. When
+    every voice is busy and the queue is full, a new note either replaces
+    a queued one chosen by the stealing policy or is dropped (policy
+    "none"). Notes already sounding are never interrupted, since blocking
+    backends such as winsound cannot be stopped mid-tone.
+    """
+
+    def __init__(self, backend=None, voices: int = DEFAULT_VOICES,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 policy: str = STEAL_OLDEST, on_error=None, on_start=None):
+        if voices < 1:
+            raise ValueError("Voice pool needs at least one voice")
+        if queue_size < 1:
+            raise ValueError("Voice queue needs at least one slot")
+        if policy not in STEAL_POLICIES:
+            raise ValueError(f"Unknown voice-stealing policy: {policy}")
+
+        self.backend = backend or get_backend()
+        self.queue_size = queue_size
+        self.policy = policy
+        self.on_error = on_error
+        self.on_start = on_start
+
+        # Statistics counters
+        self.submitted = 0
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+        self.active = 0
+
+        self._queue = deque()
+        self._serial = 0
+        self._running = True
+        self._cond = threading.Condition()
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"voice-{i}", daemon=True)
+            for i in range(voices)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, frequency: int, duration: int, volume: float = 1.0,
+               samples=None, tag=None) -> bool:
+        """Queue a note for playback; return False if it was dropped.
+
+        When pre-rendered samples are given they are passed straight to
+        the backend instead of synthesizing the tone again. A tag, if
+        given, is passed to on_start right before the note is played.
+        """
+        with self._cond:
+            if not self._running:
+                return False
+            self.submitted += 1
+            self._serial += 1
+            note = NoteRequest(frequency, duration, volume, self._serial, samples, tag)
+
+            if len(self._queue) >= self.queue_size:
+                victim = self._select_victim(note)
+                if victim is None:
+                    self.dropped += 1
+                    return False
+                self._queue.remove(victim)
+                self.stolen += 1
+
+            self._queue.append(note)
+            self._cond.notify()
+            return True
+
+    def _select_victim(self, note: NoteRequest):
+        """Pick a queued note to replace according to the policy."""
+        if self.policy == STEAL_NONE:
+            return None
+        if self.policy == STEAL_SAME_NOTE:
+            for queued in self._queue:
+                if queued.frequency == note.frequency:
+                    return queued
+        elif self.policy == STEAL_QUIETEST:
+            return min(self._queue, key=lambda queued: (queued.volume, queued.serial))
+        return self._queue[0]
+
+    def _worker(self):
+        """Play queued notes until the pool is stopped."""
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                note = self._queue.popleft()
+                self.active += 1
+            if self.on_start and note.tag is not None:
+                self.on_start(note.tag)
+            try:
+                if note.samples is not None:
+                    self.backend.play_samples(note.samples)
+                else:
+                    self.backend.play(note.frequency, note.duration)
+            except Exception as e:  # A failed note must not cost the pool a worker
+                if self.on_error:
+                    self.on_error(e)
+            finally:
+                with self._cond:
+                    self.active -= 1
+                    self.played += 1
+
+    def stats(self) -> dict:
+        """Return a snapshot of the pool counters."""
+        with self._cond:
+            return {
+                "submitted": self.submitted,
+                "played": self.played,
+                "dropped": self.dropped,
+                "stolen": self.stolen,
+                "active": self.active,
+                "queued": len(self._queue),
+            }
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Discard queued notes and stop the workers."""
+        with self._cond:
+            self._running = False
+            self._queue.clear()
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
@@ -0,0 +1,116 @@
+import queue
+import threading
+
+# Worker configuration defaults
+DEBOUNCE_MS = 250  # Typing pause before a score is re-validated
+POLL_MS = 20  # How often the main thread drains posted callbacks
+
+
+class UiQueue:
+    """Runs callbacks posted from any thread on the Tk main loop.
+
+    Tk must only be touched from the thread running mainloop, so worker
+    and playback threads post (callback, args) here instead, and the
+    main thread drains the queue every few milliseconds with after().
+    """
+
+    def __init__(self, widget, poll_ms: int = POLL_MS):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._queue = queue.SimpleQueue()
+        self._job = self.widget.after(self.poll_ms, self._drain)
+
+    def post(self, callback, *args) -> None:
+        """Queue a callback from any thread."""
+        self._queue.put((callback, args))
+
+    def _drain(self) -> None:
+        try:
+            while True:
+                try:
+                    callback, args = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                callback(*args)
+        finally:
+            # A failing callback must not stop later ones from arriving
+            self._job = self.widget.after(self.poll_ms, self._drain)
+
+    def close(self) -> None:
+        """Stop draining; callbacks still queued are dropped."""
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+
+class ValidationWorker:
+    """Parses scores on a background thread, keeping only the newest one.
+
+    Each submit() supersedes the previous request: a queued request is
+    replaced and a running one is told to stop through its cancel event.
+    Results are posted to the UI queue tagged with their generation, and
+    stale generations are dropped before reaching the editor.
+    """
+
+    def __init__(self, ui: UiQueue, on_result):
+        self.ui = ui
+        self.on_result = on_result  # Main thread: (notes, errors), or (None, exception)
+        self.generation = 0
+        self._pending = None
+        self._cancel = threading.Event()
+        self._closed = False
+        self._wake = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="score-validation", daemon=True)
+        self._thread.start()
+
+    def submit(self, job) -> int:
+        """Validate in the background; job(cancel) returns (notes, errors).
+
+        The job runs on the worker thread, so it must only use a snapshot
+        taken on the main thread, never the Tk widget itself.
+        """
+        with self._wake:
+            self.generation += 1
+            self._cancel.set()
+            self._pending = (self.generation, job)
+            self._wake.notify()
+        return self.generation
+
+    def _run(self) -> None:
+        while True:
+            with self._wake:
+                while self._pending is None and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                generation, job = self._pending
+                self._pending = None
+                cancel = self._cancel = threading.Event()
+            try:
+                result = job(cancel)
+            except Exception as e:  # Reported like a parse failure
+                result = e
+            if not cancel.is_set():
+                self.ui.post(self._deliver, generation, result)
+
+    def _deliver(self, generation: int, result) -> None:
+        if generation != self.generation:
+            return
+        if isinstance(result, Exception):
+            self.on_result(None, result)
+        else:
+            self.on_result(*result)
+
+    def cancel(self) -> None:
+        """Drop any queued or running request."""
+        with self._wake:
+            self.generation += 1
+            self._cancel.set()
+            self._pending = None
+
+    def close(self) -> None:
+        """Cancel outstanding work and let the thread exit."""
+        self.cancel()
+        with self._wake:
+            self._closed = True
+            self._wake.notify()
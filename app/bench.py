@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from app.assets.modules.audio import NullBackend
+from app.assets.modules.highlighter import IncrementalHighlighter, tokenize_lines
+from app.assets.modules.jsonscore import read_json_notes, write_json_notes
+from app.assets.modules.midifile import read_midi, write_midi
+from app.assets.modules.parser import MIN_FREQUENCY, parse_notes, dump_notes
+from app.assets.modules.voices import VoicePool
+
+# Benchmark configuration defaults
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_REPEAT = 3
+DEFAULT_OUTPUT = "bench_results.json"
+MAX_DISPATCH_NOTES = 10_000  # Keypress dispatch is timed on at most this many notes
+MAX_EVAL_NOTES = 100_000  # The legacy eval() baseline is slow and memory hungry
+
+
+def generate_score(count: int, seed: int = 0) -> dict:
+    """Generate a reproducible score with the given number of notes."""
+    rng = random.Random(seed)
+    return {i: (rng.randint(MIN_FREQUENCY, 4000), rng.randint(50, 1000))
+            for i in range(1, count + 1)}
+
+
+class NullText:
+    """Minimal stand-in for tk.Text, used when no display is available.
+
+    It stores the buffer as a list of lines and records tag calls, which
+    is enough to time the highlighter's own work without Tk.
+    """
+
+    def __init__(self, text: str):
+        self.lines = text.split('\n')
+        self.tag_calls = 0
+
+    def index(self, index: str) -> str:
+        if index == "end-1c":
+            return f"{len(self.lines)}.{len(self.lines[-1])}"
+        return "1.0"
+
+    def get(self, start: str, end: str) -> str:
+        first = int(start.split('.')[0])
+        last = int(end.split('.')[0])
+        return '\n'.join(self.lines[first - 1:last])
+
+    def tag_remove(self, tag, start, end):
+        self.tag_calls += 1
+
+    def tag_add(self, tag, *ranges):
+        self.tag_calls += 1
+
+
+def make_text_widget(text: str):
+    """Return a real Tk text widget if a display is available, else NullText."""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception:
+        return NullText(text), None
+    widget = tk.Text(root)
+    widget.insert("1.0", text)
+    return widget, root
+
+
+def timed(func, repeat: int) -> float:
+    """Return the best wall time of several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def legacy_eval(text: str) -> dict:
+    """The eval()-based parse that format_notes used to perform."""
+    notes = eval(text.strip())
+    return {int(k): (int(v[0]), int(v[1])) for k, v in notes.items()}
+
+
+def bench_size(count: int, repeat: int, report=print) -> list:
+    """Time every stage on a generated score of the given size."""
+    notes = generate_score(count)
+    text = dump_notes(notes)
+    results = []
+
+    def record(stage, seconds, items=count, **extra):
+        entry = {"stage": stage, "notes": items, "seconds": seconds,
+                 "notes_per_second": items / seconds if seconds else None}
+        entry.update(extra)
+        results.append(entry)
+        report(f"{stage:>22} {items:>9} notes {seconds * 1000:10.1f} ms")
+
+    record("parse", timed(lambda: parse_notes(text), repeat))
+    if count <= MAX_EVAL_NOTES:
+        record("parse_eval_legacy", timed(lambda: legacy_eval(text), repeat))
+    record("format", timed(lambda: dump_notes(notes), repeat))
+
+    lines = text.split('\n')
+    record("highlight_tokenize", timed(lambda: tokenize_lines(lines), repeat))
+    widget, root = make_text_widget(text)
+    highlighter = IncrementalHighlighter(widget)
+    # One synchronous pass; highlight_all would spread it over Tk callbacks
+    record("highlight_full", timed(lambda: highlighter.highlight_lines(1, len(lines)), repeat),
+           widget=type(widget).__name__)
+    middle = len(lines) // 2
+    record("highlight_keystroke",
+           timed(lambda: highlighter.highlight_lines(middle - 1, middle + 1), repeat),
+           items=1, widget=type(widget).__name__)
+    if root is not None:
+        root.destroy()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "score.json")
+        record("json_save", timed(lambda: write_json_notes(path, notes), repeat))
+        record("json_load", timed(lambda: read_json_notes(path), repeat))
+        path = os.path.join(tmp, "score.mid")
+        record("midi_save", timed(lambda: write_midi(path, notes), repeat))
+        record("midi_load", timed(lambda: read_midi(path), repeat))
+
+    dispatch = min(count, MAX_DISPATCH_NOTES)
+    record("keypress_pool", timed(lambda: dispatch_pool(dispatch), repeat), items=dispatch)
+    record("keypress_thread_legacy",
+           timed(lambda: dispatch_threads(dispatch), repeat), items=dispatch)
+    return results
+
+
+def dispatch_pool(count: int) -> None:
+    """Submit keypresses to a voice pool with a silent backend."""
+    pool = VoicePool(NullBackend(), queue_size=count)
+    for _ in range(count):
+        pool.submit(440, 300)
+    pool.stop()
+
+
+def dispatch_threads(count: int) -> None:
+    """Start one thread per keypress, as play_sound used to."""
+    backend = NullBackend()
+    for _ in range(count):
+        threading.Thread(target=backend.play, args=(440, 300), daemon=True).start()
+
+
+def git_revision() -> str:
+    """Return the current git revision, if available."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> int:
+    """Run the benchmark suite and write machine-readable results."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.bench",
+        description="Benchmark the WinPiano parse, format, highlight, load and playback paths."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="score sizes in notes")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="runs per stage, the best one is kept")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT,
+                        help=f"JSON results file (default: {DEFAULT_OUTPUT})")
+    args = parser.parse_args(argv)
+
+    results = []
+    for count in args.sizes:
+        results.extend(bench_size(count, args.repeat))
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump({
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "results": results,
+        }, file, indent=4)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
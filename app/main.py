@@ -1,20 +1,38 @@
+import time
+
+_IMPORT_START = time.perf_counter()
+
+import argparse
 import os
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
-import winsound
-import threading
-from app.assets.modules.creator import creator_notes
-from app.assets.modules.setting import settings_notes
+from app.assets.modules.audio import get_backend
+from app.assets.modules.voices import VoicePool
+from app.assets.modules.keystate import KeyTracker
+from app.assets.modules.keyboard import PianoKeyboard, key_name, key_number
+from app.assets.modules.recorder import PerformanceRecorder, NOTE_ON, NOTE_OFF
+from app.assets.modules.worker import UiQueue
+from app.assets.modules.latency import (
+    LatencyProbe, LatencyOverlay, STAGE_LOOKUP, STAGE_QUEUED, STAGE_START
+)
+
+# The editor, settings and score parser are imported on first use, see open_editor
+DEFERRED_MODULES = (
+    "app.assets.modules.creator", "app.assets.modules.setting", "app.assets.modules.parser"
+)
+
+_IMPORT_END = time.perf_counter()
 
 # Constants for UI configuration
 BG_COLOR = "#2D2D2D"
-WHITE_KEY_COLOR = "#F8F9FA"
 BLACK_KEY_COLOR = "#2B2B2B"
-ACTIVE_WHITE_COLOR = "#E2E6EA"
 ACTIVE_BLACK_COLOR = "#404040"
 FONT_FAMILY = "Consolas"
 FONT_SIZE = 12
 ICON_PATH = "app/assets/icon/piano.ico"
+NOTE_DURATION = 300  # Note length for backends that cannot hold notes, in ms
+SUSTAIN_KEY = "space"  # Sustain pedal keysym, None to disable
 
 # Key bindings for keyboard input
 KEY_BINDINGS = {
@@ -29,10 +47,6 @@ MODES = [
     "Вторая", "Третья", "Четвертая", "Пятая", "Шестая", "Седьмая"
 ]
 
-# Note positions for white and black keys on the piano UI
-WHITE_NOTES = [("C", 0), ("D", 2), ("E", 4), ("F", 5), ("G", 7), ("A", 9), ("B", 11)]
-BLACK_NOTES = [("C#", 1), ("D#", 3), ("F#", 6), ("G#", 8), ("A#", 10)]
-
 # Predefined frequencies for each note across different octaves
 FREQUENCIES = {
     "C": [16, 32, 65, 131, 262, 523, 1046, 2093, 4186, 8372, 16744],
@@ -53,9 +67,22 @@ FREQUENCIES = {
 class PianoApp:
     """Main class for the virtual piano application."""
 
-    def __init__(self, root):
+    def __init__(self, root, backend=None, sustain_key: str = SUSTAIN_KEY):
         """Initialize the main application window and components."""
         self.root = root
+        self.backend = backend or get_backend()
+        self.sustain_key = sustain_key
+        self.keys = KeyTracker(root, self.start_bound_key, self.stop_note)
+        self.recorder = PerformanceRecorder()
+        self.latency = LatencyProbe()
+        self.latency_overlay = None
+        # Voice workers report failures through the main loop
+        self.ui_queue = UiQueue(root)
+        self.voices = VoicePool(
+            self.backend,
+            on_error=lambda e: self.ui_queue.post(self.show_sound_error, e),
+            on_start=lambda slot: self.latency.mark(slot, STAGE_START)
+        )
         self.mode = 4  # Default octave (Первая/First)
         self.initialize_window()
         # self.setup_icon()  # Currently commented out due to potential path issues
@@ -65,7 +92,6 @@ class PianoApp:
     def initialize_window(self):
         """Configure main window properties."""
         self.root.title("WinPiano: Play mode")
-        self.root.geometry("635x320")
         self.root.configure(bg=BG_COLOR)
         self.root.resizable(False, False)
 
@@ -110,51 +136,13 @@ class PianoApp:
                            relief=[('pressed', 'sunken'), ('!pressed', 'raised')])
 
     def create_keys_frame(self):
-        """Create the piano keys interface."""
-        self.keys_frame = ttk.Frame(self.root)
-        self.keys_frame.grid(row=0, column=0, columnspan=12, pady=(20, 10), padx=20)
-
-        # Create white keys
-        for note, col in WHITE_NOTES:
-            self.create_white_key(note, col)
-
-        # Create black keys
-        for note, col in BLACK_NOTES:
-            self.create_black_key(note, col)
-
-    def create_white_key(self, note, column):
-        """Create a single white piano key."""
-        btn = tk.Button(
-            self.keys_frame,
-            text=note,
-            bg=WHITE_KEY_COLOR,
-            fg=BLACK_KEY_COLOR,
-            activebackground=ACTIVE_WHITE_COLOR,
-            font=(FONT_FAMILY, FONT_SIZE, 'bold'),
-            borderwidth=1,
-            relief='raised',
-            width=6,
-            height=10
+        """Create the piano keyboard canvas."""
+        self.keyboard = PianoKeyboard(
+            self.root,
+            on_press=self.start_key,
+            on_release=self.stop_note
         )
-        btn.grid(row=0, column=column, sticky='nsew')
-        btn.configure(command=lambda n=note: self.play_note(n))
-
-    def create_black_key(self, note, column):
-        """Create a single black piano key."""
-        btn = tk.Button(
-            self.keys_frame,
-            text=note,
-            bg=BLACK_KEY_COLOR,
-            fg=WHITE_KEY_COLOR,
-            activebackground=ACTIVE_BLACK_COLOR,
-            font=(FONT_FAMILY, FONT_SIZE - 1, 'bold'),
-            borderwidth=0,
-            relief='raised',
-            width=3,
-            height=6
-        )
-        btn.grid(row=0, column=column, sticky='n', pady=(0, 50))
-        btn.configure(command=lambda n=note: self.play_note(n))
+        self.keyboard.grid(row=0, column=0, columnspan=12, pady=(20, 10), padx=20)
 
     def create_control_panel(self):
         """Create the bottom control panel."""
@@ -179,7 +167,7 @@ class PianoApp:
         self.settings_btn = ttk.Button(
             self.control_frame,
             text="Settings",
-            command=lambda: settings_notes(self.root),
+            command=self.open_settings,
             style='Control.TButton'
         )
         self.settings_btn.pack(side='right', padx=20)
@@ -187,66 +175,224 @@ class PianoApp:
         self.editor_btn = ttk.Button(
             self.control_frame,
             text="Editor",
-            command=lambda: creator_notes(self.root),
+            command=self.open_editor,
             style='Control.TButton'
         )
         self.editor_btn.pack(side='right', padx=10)
 
+        self.record_btn = ttk.Button(
+            self.control_frame,
+            text="Record",
+            command=self.toggle_recording,
+            style='Control.TButton'
+        )
+        self.record_btn.pack(side='right', padx=10)
+
+    def open_settings(self):
+        """Open the settings window, importing it on first use."""
+        from app.assets.modules.setting import settings_notes
+        settings_notes(self.root)
+
+    def open_editor(self, notes=None):
+        """Open the notes editor, importing it on first use."""
+        from app.assets.modules.creator import creator_notes
+        creator_notes(self.root, notes)
+
+    def toggle_recording(self, event=None):
+        """Start recording, or stop and hand the take to the editor or a file."""
+        if not self.recorder.recording:
+            self.recorder.start()
+            self.record_btn.configure(text="Stop")
+            return
+        self.keys.release_all()
+        self.recorder.stop()
+        self.record_btn.configure(text="Record")
+        notes = self.recorder.to_sequence(self.key_frequency)
+        if not notes:
+            return
+
+        choice = messagebox.askyesnocancel(
+            "Recording",
+            f"Recorded {len(notes)} notes.\nOpen them in the editor? (No saves to a file)"
+        )
+        if choice:
+            self.open_editor(notes)
+        elif choice is not None:
+            self.save_recording(notes)
+
+    def save_recording(self, notes):
+        """Write a recording straight to a score file."""
+        from tkinter import filedialog
+        from app.assets.modules.binscore import save_score
+        filepath = filedialog.asksaveasfilename(
+            title="Save Recording",
+            filetypes=[
+                ("Binary Scores", "*.wpsc"),
+                ("MIDI Files", "*.mid"),
+                ("JSON Files", "*.json"),
+                ("Text Files", "*.txt")
+            ],
+            defaultextension=".wpsc"
+        )
+        if filepath:
+            try:
+                save_score(filepath, notes)
+            except Exception as e:
+                messagebox.showerror("Error", f"Save error: {str(e)}")
+
+    @staticmethod
+    def key_frequency(number: int) -> int:
+        """Frequency of a keyboard key number from the octave table."""
+        note_name, octave = key_name(number)
+        return FREQUENCIES[note_name][octave]
+
     def bind_events(self):
         """Bind keyboard and UI events."""
         self.root.bind("<KeyPress>", self.handle_key_press)
+        self.root.bind("<KeyRelease>", self.handle_key_release)
+        self.root.bind("<FocusOut>", lambda event: self.keys.release_all())
         self.octave_combobox.bind("<<ComboboxSelected>>", self.select_octave)
         self.root.bind('<Up>', self.prev_octave)
         self.root.bind('<Down>', self.next_octave)
+        self.root.bind('<F12>', self.toggle_latency_overlay)
+        self.root.bind('<F9>', self.toggle_recording)
 
     @staticmethod
-    def play_sound(frequency: int, duration: int = 300):
-        """Play sound using winsound in a separate thread."""
+    def show_sound_error(error: Exception):
+        """Report a playback failure from a voice worker."""
+        messagebox.showerror("Sound Error", f"Failed to play sound:\n{str(error)}")
 
-        def sound_thread():
-            try:
-                winsound.Beep(frequency, duration)
-            except RuntimeError as e:
-                messagebox.showerror("Sound Error", f"Failed to play sound:\n{str(e)}")
+    def play_sound(self, frequency: int, duration: int = NOTE_DURATION, slot: int = None):
+        """Queue sound on the voice pool."""
+        self.voices.submit(frequency, duration, tag=slot)
 
-        threading.Thread(target=sound_thread, daemon=True).start()
-
-    def play_note(self, note_name: str):
-        """Play note based on current octave."""
-        note_name = note_name.upper()
+    def note_frequency(self, note_name: str, octave: int):
+        """Return the note's frequency in an octave, or None."""
         try:
-            freq = FREQUENCIES[note_name][self.mode]
+            return FREQUENCIES[note_name][octave]
         except (KeyError, IndexError) as e:
             messagebox.showerror("Note Error", f"Invalid note or octave:\n{str(e)}")
+            return None
+
+    def play_note(self, note_name: str, slot: int = -1, octave: int = None):
+        """Play note in the given octave, the current one by default."""
+        note_name = note_name.upper()
+        octave = self.mode if octave is None else octave
+        freq = self.note_frequency(note_name, octave)
+        if freq is None:
             return
-        self.play_sound(freq)
+        self.latency.mark(slot, STAGE_LOOKUP)
+        self.play_sound(freq, slot=slot if slot >= 0 else None)
+        self.latency.mark(slot, STAGE_QUEUED)
 
     def select_octave(self, event):
         """Handle octave selection from combobox."""
-        self.mode = MODES.index(self.octave_combobox.get())
+        self.set_octave(MODES.index(self.octave_combobox.get()))
+
+    def set_octave(self, index: int):
+        """Switch the current octave."""
+        self.mode = index
 
     def prev_octave(self, event):
         """Switch to previous octave using up arrow key."""
         new_index = max(self.mode - 1, 0)
         self.octave_combobox.set(MODES[new_index])
-        self.mode = new_index
+        self.set_octave(new_index)
 
     def next_octave(self, event):
         """Switch to next octave using down arrow key."""
         new_index = min(self.mode + 1, len(MODES) - 1)
         self.octave_combobox.set(MODES[new_index])
-        self.mode = new_index
+        self.set_octave(new_index)
+
+    def start_note(self, note_name: str, octave: int):
+        """Note-on; returns a handle for stop_note()."""
+        slot = self.latency.begin()
+        number = key_number(note_name, octave)
+        self.recorder.record(NOTE_ON, number)
+        self.keyboard.press_key(number)
+        if not self.backend.supports_hold:
+            # Blocking backends play a fixed-length note instead
+            self.play_note(note_name, slot, octave)
+            return number, None
+        freq = self.note_frequency(note_name, octave)
+        if freq is None:
+            return number, None
+        self.latency.mark(slot, STAGE_LOOKUP)
+        voice = self.backend.note_on(freq)
+        self.latency.mark(slot, STAGE_QUEUED)
+        self.latency.mark(slot, STAGE_START)
+        return number, voice
+
+    def start_bound_key(self, key: str):
+        """Note-on for a computer key in the current octave."""
+        return self.start_note(KEY_BINDINGS[key], self.mode)
+
+    def start_key(self, number: int):
+        """Note-on for a key clicked on the keyboard canvas."""
+        return self.start_note(*key_name(number))
+
+    def stop_note(self, handle):
+        """Note-off for a handle returned by start_note()."""
+        if handle is None:
+            return
+        number, voice = handle
+        self.recorder.record(NOTE_OFF, number)
+        self.keyboard.release_key(number)
+        if voice is not None:
+            self.backend.note_off(voice)
 
     def handle_key_press(self, event):
         """Handle keyboard input for note playing."""
-        if event.char and event.char.lower() in KEY_BINDINGS:
-            self.play_note(KEY_BINDINGS[event.char.lower()])
-
-
-def main():
+        key = event.keysym.lower()
+        if key == self.sustain_key:
+            self.keys.pedal_down()
+        elif key in KEY_BINDINGS:
+            self.keys.press(key)
+
+    def handle_key_release(self, event):
+        """Release held notes and the sustain pedal."""
+        key = event.keysym.lower()
+        if key == self.sustain_key:
+            self.keys.pedal_up()
+        elif key in KEY_BINDINGS:
+            self.keys.release(key)
+
+    def toggle_latency_overlay(self, event=None):
+        """Show or hide the live key-to-sound latency overlay."""
+        if self.latency_overlay and self.latency_overlay.winfo_exists():
+            self.latency_overlay.destroy()
+            self.latency_overlay = None
+        else:
+            self.latency_overlay = LatencyOverlay(self.root, self.latency)
+
+
+def report_startup(root, window_start: float, window_end: float):
+    """Print import, window and first-frame times, then close the app."""
+    root.update_idletasks()
+    first_frame = time.perf_counter()
+    loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+    print(f"imports:     {(_IMPORT_END - _IMPORT_START) * 1000:8.1f} ms")
+    print(f"window:      {(window_end - window_start) * 1000:8.1f} ms")
+    print(f"first frame: {(first_frame - window_end) * 1000:8.1f} ms")
+    print(f"total:       {(first_frame - _IMPORT_START) * 1000:8.1f} ms")
+    print(f"deferred modules loaded at startup: {', '.join(loaded) or 'none'}")
+    root.destroy()
+
+
+def main(argv=None):
     """Entry point for the application."""
+    parser = argparse.ArgumentParser(prog="python -m app.main", description="WinPiano")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="report import and first-frame times, then exit")
+    args = parser.parse_args(argv)
+
+    window_start = time.perf_counter()
     root = tk.Tk()
     PianoApp(root)
+    if args.startup_time:
+        window_end = time.perf_counter()
+        root.after_idle(report_startup, root, window_start, window_end)
     root.mainloop()
 
 
@@ -0,0 +1,125 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app.assets.modules.audio import SAMPLE_RATE
+from app.assets.modules.binscore import BINARY_EXTENSION, BinaryScore, load_score
+from app.assets.modules.midifile import MIDI_EXTENSIONS
+from app.assets.modules.renderer import render_to_wav
+
+# Score files picked up from the input directory
+SCORE_EXTENSIONS = (".txt", ".json", BINARY_EXTENSION) + MIDI_EXTENSIONS
+
+
+class RenderResult:
+    """Outcome of rendering a single score file."""
+
+    __slots__ = ("source", "target", "notes", "audio_seconds", "error")
+
+    def __init__(self, source: str, target: str, notes: int = 0,
+                 audio_seconds: float = 0.0, error: str = None):
+        self.source = source
+        self.target = target
+        self.notes = notes
+        self.audio_seconds = audio_seconds
+        self.error = error
+
+
+def render_file(source: str, target: str, sample_rate: int = SAMPLE_RATE) -> RenderResult:
+    """Render one score file to WAV, capturing any error."""
+    try:
+        notes = load_score(source)
+        try:
+            seconds = render_to_wav(notes, target, sample_rate)
+            return RenderResult(source, target, len(notes), seconds)
+        finally:
+            if isinstance(notes, BinaryScore):
+                notes.close()
+    except Exception as e:
+        return RenderResult(source, target, error=f"{type(e).__name__}: {e}")
+
+
+def find_scores(directory: str) -> list:
+    """List score files in a directory, sorted by name."""
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(SCORE_EXTENSIONS)
+    )
+
+
+def output_names(sources: list) -> list:
+    """Pair each score with a WAV file name, keeping same-stem scores apart."""
+    stems = [os.path.splitext(os.path.basename(source)) for source in sources]
+    counts = {}
+    for stem, _ in stems:
+        counts[stem] = counts.get(stem, 0) + 1
+    return [
+        (source, f"{stem}.wav" if counts[stem] == 1 else f"{stem}_{ext[1:]}.wav")
+        for source, (stem, ext) in zip(sources, stems)
+    ]
+
+
+def render_directory(source_dir: str, output_dir: str, workers: int = None,
+                     sample_rate: int = SAMPLE_RATE, report=print) -> list:
+    """Render every score in a directory to WAV files in a process pool."""
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(source, os.path.join(output_dir, name))
+            for source, name in output_names(find_scores(source_dir))]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_file, source, target, sample_rate)
+                   for source, target in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result.error:
+                report(f"FAILED {result.source}: {result.error}")
+            else:
+                report(f"ok     {result.source} -> {result.target} "
+                       f"({result.notes} notes, {result.audio_seconds:.1f}s)")
+    return results
+
+
+def summarize(results: list, wall_seconds: float) -> str:
+    """Build a throughput summary for a batch run."""
+    rendered = [r for r in results if not r.error]
+    notes = sum(r.notes for r in rendered)
+    audio = sum(r.audio_seconds for r in rendered)
+    wall = max(wall_seconds, 1e-9)
+    return (
+        f"{len(rendered)} rendered, {len(results) - len(rendered)} failed in {wall_seconds:.2f}s\n"
+        f"{notes / wall:,.0f} notes/s, {audio / wall:,.1f} seconds of audio per wall-second"
+    )
+
+
+def main(argv=None) -> int:
+    """Entry point for headless batch rendering."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.render",
+        description="Render a directory of WinPiano scores to WAV files."
+    )
+    parser.add_argument("source", help="directory with .txt, .json, .wpsc or MIDI scores")
+    parser.add_argument("output", help="directory for the rendered .wav files")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--sample-rate", type=int, default=SAMPLE_RATE,
+                        help=f"output sample rate (default: {SAMPLE_RATE})")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.source):
+        parser.error(f"not a directory: {args.source}")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    start = time.perf_counter()
+    results = render_directory(args.source, args.output, args.workers, args.sample_rate)
+    print(summarize(results, time.perf_counter() - start))
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import argparse
+import sys
+import time
+
+from app.assets.modules.binscore import BinaryScore, load_score, save_score
+from app.assets.modules.parser import MIN_FREQUENCY, MAX_FREQUENCY
+from app.assets.modules.transform import (
+    transpose, scale_durations, quantize, reverse, filter_range
+)
+
+
+def build_steps(args) -> list:
+    """Turn parsed options into (description, transform) steps in a fixed order."""
+    steps = []
+    if args.low is not None or args.high is not None:
+        low = MIN_FREQUENCY if args.low is None else args.low
+        high = MAX_FREQUENCY if args.high is None else args.high
+        steps.append((f"filter {low}-{high} Hz",
+                      lambda notes: filter_range(notes, low, high, keep_time=not args.drop)))
+    if args.semitones or args.cents:
+        steps.append((f"transpose {args.semitones:+g} st {args.cents:+g} ct",
+                      lambda notes: transpose(notes, args.semitones, args.cents)))
+    if args.tempo != 1.0:
+        steps.append((f"tempo x{args.tempo:g}",
+                      lambda notes: scale_durations(notes, 1.0 / args.tempo)))
+    if args.quantize:
+        steps.append((f"quantize {args.quantize} ms",
+                      lambda notes: quantize(notes, args.quantize)))
+    if args.reverse:
+        steps.append(("reverse", reverse))
+    return steps
+
+
+def main(argv=None) -> int:
+    """Entry point for headless score transforms."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.transform",
+        description="Transpose, retime, quantize, reverse or filter a WinPiano score.",
+        epilog="Steps run in this order: filter, transpose, tempo, quantize, reverse."
+    )
+    parser.add_argument("source", help=".txt, .json, .wpsc or MIDI score to read")
+    parser.add_argument("output", help="score to write; the format follows the extension")
+    parser.add_argument("-s", "--semitones", type=float, default=0,
+                        help="transpose by semitones, negative to go down")
+    parser.add_argument("-c", "--cents", type=float, default=0,
+                        help="transpose by cents, added to --semitones")
+    parser.add_argument("-t", "--tempo", type=float, default=1.0,
+                        help="tempo factor, 1.1 plays 10%% faster")
+    parser.add_argument("-q", "--quantize", type=int, default=0, metavar="MS",
+                        help="snap note boundaries to a grid in milliseconds")
+    parser.add_argument("-r", "--reverse", action="store_true", help="play the score backwards")
+    parser.add_argument("--low", type=int, help="keep notes at or above this frequency")
+    parser.add_argument("--high", type=int, help="keep notes at or below this frequency")
+    parser.add_argument("--drop", action="store_true",
+                        help="remove filtered notes instead of turning them into rests")
+    args = parser.parse_args(argv)
+
+    if args.tempo <= 0:
+        parser.error("--tempo must be positive")
+    if args.quantize < 0:
+        parser.error("--quantize must not be negative")
+
+    try:
+        notes = load_score(args.source)
+        if isinstance(notes, BinaryScore):
+            with notes:
+                notes = notes.to_sequence()
+        print(f"{args.source}: {len(notes)} notes")
+        for description, step in build_steps(args):
+            start = time.perf_counter()
+            notes = step(notes)
+            print(f"{description:>28} {(time.perf_counter() - start) * 1000:8.1f} ms")
+        save_score(args.output, notes)
+    except (OSError, ValueError) as e:
+        print(f"FAILED {args.source}: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    print(f"{args.output}: {len(notes)} notes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())